@@ -6,15 +6,27 @@ https://github.com/bmcclure/ha-aquanta
 
 from __future__ import annotations
 
-from aquanta import Aquanta
-
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .api import create_transport_client
+from .const import CONF_PROXY_TOKEN, CONF_PROXY_URL, DOMAIN, LOGGER
 from .coordinator import AquantaCoordinator
+from .executor import async_get_executor
+from .proxy import async_register_proxy_view, proxy_account_key
+from .services import async_setup_services
+from .session import async_pop_login, login
+from .transport import ProxyTransport
+from .websocket_api import async_register_websocket_commands
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -23,33 +35,82 @@ PLATFORMS: list[Platform] = [
     Platform.WATER_HEATER,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Aquanta component."""
+    async_register_websocket_commands(hass)
+    async_setup_services(hass)
+    async_register_proxy_view(hass)
+    return True
+
+
+def _proxy_options(entry: ConfigEntry) -> tuple[str | None, str | None]:
+    """Return the URL and token of the instance the entry reads through."""
+    return entry.options.get(CONF_PROXY_URL), entry.options.get(CONF_PROXY_TOKEN)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
 
-    try:
-        aquanta = await hass.async_add_executor_job(
-            Aquanta, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
+    proxy_url, proxy_token = _proxy_options(entry)
+
+    if proxy_url:
+        # Another instance polls Aquanta and shares its snapshots
+        aquanta = create_transport_client(
+            ProxyTransport(
+                proxy_url,
+                proxy_token or "",
+                proxy_account_key(entry.data[CONF_USERNAME]),
+            )
+        )
+    else:
+        aquanta = async_pop_login(
+            hass, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
         )
-    except RuntimeError as err:
-        raise ConfigEntryAuthFailed(err) from err
+
+    if aquanta is None:
+        try:
+            aquanta = await async_get_executor(hass).async_run(
+                login, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
+            )
+        except RuntimeError as err:
+            raise ConfigEntryAuthFailed(err) from err
 
     coordinator = AquantaCoordinator(
         hass,
         aquanta,
         entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
     )
+    coordinator.proxy_options = (proxy_url, proxy_token)
+    coordinator.async_apply_options(entry.options)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-    await coordinator.async_config_entry_first_refresh()
+    # Platforms go first so entities are added as each device's data arrives
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await async_unload_entry(hass, entry)
+        raise
 
     if entry.unique_id is None:
-        await hass.config_entries.async_update_entry(
+        hass.config_entries.async_update_entry(
             entry, unique_id=entry.data[CONF_USERNAME]
         )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
+
+    @callback
+    def _async_finish_export(_event: Event) -> None:
+        coordinator.async_stop_exporting()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_finish_export)
+    )
 
     return True
 
@@ -57,7 +118,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: AquantaCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_stop_recording()
+        coordinator.async_stop_hedging()
+        coordinator.async_stop_exporting()
     return unloaded
 
 
@@ -65,3 +129,40 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
     await async_setup_entry(hass, entry)
+
+
+async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply config entry changes to the running coordinator."""
+    coordinator: AquantaCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_apply_options(entry.options)
+
+    if entry.data[CONF_USERNAME] != coordinator.account_id or (
+        _proxy_options(entry) != coordinator.proxy_options
+    ):
+        # Unique IDs are derived from the account and the client from the
+        # proxy options, so everything is rebuilt
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    if entry.data[CONF_PASSWORD] != coordinator.password:
+        if coordinator.proxy_options[0]:
+            # The serving instance holds the Aquanta login
+            coordinator.password = entry.data[CONF_PASSWORD]
+            return
+
+        aquanta = async_pop_login(
+            hass, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
+        )
+
+        if aquanta is None:
+            try:
+                aquanta = await async_get_executor(hass).async_run(
+                    login, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
+                )
+            except RuntimeError as err:
+                LOGGER.warning("Aquanta login failed after entry update: %s", err)
+                entry.async_start_reauth(hass)
+                return
+
+        coordinator.async_set_client(aquanta, entry.data[CONF_PASSWORD])
+        await coordinator.async_request_refresh()
@@ -0,0 +1,104 @@
+"""Account-wide totals maintained from per-device changes."""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+from .payload import mode_active
+
+
+class _Contribution(NamedTuple):
+    """What a single device adds to the fleet totals."""
+
+    temperature: float
+    temperature_count: int
+    available: float
+    away: int
+    boost: int
+    control_disabled: int
+
+
+def _contribution(device: dict[str, Any]) -> _Contribution:
+    temperature = device["water"]["temperature"]
+    available = device["water"]["available"]
+    return _Contribution(
+        temperature or 0.0,
+        int(temperature is not None),
+        available or 0.0,
+        int(mode_active(device["info"], "away")),
+        int(mode_active(device["info"], "boost")),
+        int(not device["advanced"]["controlEnabled"]),
+    )
+
+
+class FleetAggregate:
+    """Totals over every device of an account.
+
+    Each device's contribution is remembered, so a refresh only adjusts the
+    totals by the difference for devices whose payload actually changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty totals."""
+        self._contributions: dict[Any, _Contribution] = {}
+        self._totals = [0.0] * len(_Contribution._fields)
+        self.version = 0
+
+    def _apply(self, contribution: _Contribution, sign: int) -> None:
+        for index, value in enumerate(contribution):
+            self._totals[index] += sign * value
+
+    def update(self, aquanta_id, device: dict[str, Any]) -> None:
+        """Account for a device's latest payload."""
+        contribution = _contribution(device)
+        previous = self._contributions.get(aquanta_id)
+        if previous == contribution:
+            return
+
+        if previous is not None:
+            self._apply(previous, -1)
+        self._apply(contribution, 1)
+        self._contributions[aquanta_id] = contribution
+        self.version += 1
+
+    def remove(self, aquanta_id) -> None:
+        """Forget a device that left the account."""
+        if (previous := self._contributions.pop(aquanta_id, None)) is not None:
+            self._apply(previous, -1)
+            self.version += 1
+
+    def _total(self, field: str) -> float:
+        return self._totals[_Contribution._fields.index(field)]
+
+    @property
+    def devices(self) -> int:
+        """Return the number of devices."""
+        return len(self._contributions)
+
+    @property
+    def average_temperature(self) -> float | None:
+        """Return the average tank temperature."""
+        count = self._total("temperature_count")
+        if not count:
+            return None
+        return self._total("temperature") / count
+
+    @property
+    def total_available(self) -> float:
+        """Return the hot water available, in full-tank equivalents."""
+        return self._total("available")
+
+    @property
+    def away(self) -> int:
+        """Return the number of devices in away mode."""
+        return round(self._total("away"))
+
+    @property
+    def boost(self) -> int:
+        """Return the number of devices in boost mode."""
+        return round(self._total("boost"))
+
+    @property
+    def control_disabled(self) -> int:
+        """Return the number of devices with Aquanta control disabled."""
+        return round(self._total("control_disabled"))
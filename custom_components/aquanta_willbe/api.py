@@ -0,0 +1,318 @@
+"""HTTP layer between the integration and the Aquanta cloud."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from functools import partial
+import hashlib
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from aquanta import Aquanta
+from aquanta.aquanta import AquantaHelper
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .const import LOGGER
+from .payload import project_advanced, project_info, project_water
+from .transport import CloudTransport, LocalTransport, ProxyTransport
+
+if TYPE_CHECKING:
+    from .hedge import RequestHedger
+    from .trace import TraceRecorder
+
+
+# How long each device resource is served from cache. Shorter than the
+# minimum poll interval, so scheduled polls always see fresh data while
+# bursts of refresh requests share one fetch.
+ENDPOINT_TTL = {
+    "water": timedelta(seconds=20),
+    "infocenter": timedelta(seconds=20),
+    "advanced": timedelta(minutes=2),
+}
+
+
+class _CacheEntry:
+    """A cached or in-flight response."""
+
+    __slots__ = ("expires", "future")
+
+    def __init__(self) -> None:
+        self.expires = math.inf
+        self.future: Future = Future()
+
+
+class _Validator(NamedTuple):
+    """What is known about the last response for a resource."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: bytes
+    result: Any
+
+    @property
+    def conditions(self) -> dict[str, str]:
+        """Return the headers that make the next GET conditional."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class AquantaApiHelper(AquantaHelper):
+    """GET, PUT and DELETE requests for the Aquanta cloud.
+
+    Responses are decoded with Home Assistant's orjson backed decoder, and a
+    GET can reduce the document to the fields the caller needs so the full
+    response is dropped right after decoding. Projected payloads are cached
+    per resource for its endpoint's TTL, and concurrent reads of a resource
+    that is already being fetched wait for that request instead of issuing
+    their own.
+
+    Projected reads are revalidated rather than refetched: the ETag and
+    Last-Modified of the previous response are sent back, and a 304 reuses
+    the previous payload. Servers that ignore them still send the full
+    document, but when its hash matches the previous one it is not decoded
+    again. Either way the caller gets the very same payload object, so
+    unchanged resources can be recognized by identity.
+
+    Requests travel over the helper's transport, see transport.py. With a
+    hedger attached, reads that are slow to answer are sent twice, see
+    hedge.py. While a recorder is attached, every exchange is also written
+    to its trace, see trace.py.
+    """
+
+    def __init__(self, session, timeout) -> None:
+        """Initialize the helper."""
+        super().__init__(session, timeout)
+        self.transport: CloudTransport | LocalTransport | ProxyTransport = (
+            CloudTransport(session, timeout)
+        )
+        self._lock = threading.Lock()
+        self._clock: Callable[[], float] = time.monotonic
+        self._cache: dict[str, _CacheEntry] = {}
+        self._validators: dict[str, _Validator] = {}
+        self._fetches: dict[str, int] = {}
+        self._fetched_at: dict[str, datetime] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidated": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+        }
+        self.hedger: RequestHedger | None = None
+        self.recorder: TraceRecorder | None = None
+
+    def invalidate(self, aquanta_id, *names: str) -> None:
+        """Drop cached resources of a device after writing to it."""
+        with self._lock:
+            for name in names:
+                if self._cache.pop(device_path(aquanta_id, name), None):
+                    self.stats["invalidated"] += 1
+
+    def get(self, path: str, project: Callable[[Any], Any] | None = None):
+        """GET HTTP request for aquanta.io PATH."""
+        if project is None:
+            return self._get(path)
+
+        with self._lock:
+            entry = self._cache.get(path)
+            if owner := (
+                entry is None
+                or (entry.future.done() and entry.expires <= self._clock())
+            ):
+                entry = self._cache[path] = _CacheEntry()
+                self.stats["misses"] += 1
+            else:
+                self.stats["hits"] += 1
+
+        if not owner:
+            return entry.future.result()
+
+        try:
+            result = self._revalidate(path, project)
+        except BaseException as err:
+            with self._lock:
+                if self._cache.get(path) is entry:
+                    self._cache.pop(path)
+            entry.future.set_exception(err)
+            raise
+
+        ttl = ENDPOINT_TTL.get(path.rsplit("/", 1)[-1])
+        entry.expires = self._clock() + (ttl.total_seconds() if ttl else 0)
+        entry.future.set_result(result)
+        return result
+
+    def _revalidate(self, path: str, project: Callable[[Any], Any]):
+        validator = self._validators.get(path)
+        headers = self.headers
+        if validator is not None:
+            headers = {**headers, **validator.conditions}
+
+        start = time.monotonic()
+        resp = self._send_get(path, headers)
+        self._record("GET", path, start, resp)
+
+        not_modified = validator is not None and resp.status_code == 304
+        if not (resp.ok or not_modified):
+            raise RuntimeError(f"Aquanta: Failed to GET {path}, {resp}")
+
+        # Even an unchanged response is a new reading
+        self._fetches[path] = self._fetches.get(path, 0) + 1
+        self._fetched_at[path] = dt_util.utcnow()
+        if not_modified:
+            self.stats["not_modified"] += 1
+            return validator.result
+
+        digest = hashlib.blake2b(resp.content, digest_size=16).digest()
+        if validator is not None and validator.digest == digest:
+            self.stats["unchanged"] += 1
+            result = validator.result
+        else:
+            result = project(json_loads(resp.content))
+
+        self._validators[path] = _Validator(
+            resp.headers.get("ETag"),
+            resp.headers.get("Last-Modified"),
+            digest,
+            result,
+        )
+        return result
+
+    def fetch_count(self, path: str) -> int:
+        """Return how often PATH was read from the API, cache hits excluded.
+
+        Unchanged resources are returned as the very same payload object,
+        so this is what tells a new reading from a cached one.
+        """
+        return self._fetches.get(path, 0)
+
+    def fetch_time(self, path: str) -> datetime | None:
+        """Return when PATH was last read from the API, if ever."""
+        return self._fetched_at.get(path)
+
+    def _get(self, path: str):
+        start = time.monotonic()
+        resp = self._send_get(path, self.headers)
+        self._record("GET", path, start, resp)
+        if not resp.ok:
+            raise RuntimeError(f"Aquanta: Failed to GET {path}, {resp}")
+
+        return json_loads(resp.content)
+
+    def _send_get(self, path: str, headers: Mapping[str, str]):
+        send = partial(self.transport.request, "GET", path, headers)
+        if (hedger := self.hedger) is None:
+            return send()
+        return hedger.request(send)
+
+    def put(self, path: str, value) -> None:
+        """PUT HTTP request for aquanta.io PATH."""
+        start = time.monotonic()
+        resp = self.transport.request("PUT", path, self.headers, value)
+        self._record("PUT", path, start, resp)
+        if not resp.ok:
+            raise RuntimeError(f"Aquanta: Failed to PUT {path}, {resp}: {resp.text}")
+
+    def delete(self, path: str) -> None:
+        """DELETE HTTP request for aquanta.io PATH."""
+        start = time.monotonic()
+        resp = self.transport.request("DELETE", path, self.headers)
+        self._record("DELETE", path, start, resp)
+        if not resp.ok:
+            raise RuntimeError(
+                f"Aquanta: Failed to DELETE {path}, {resp}: {resp.text}"
+            )
+
+    def _record(self, method: str, path: str, start: float, resp) -> None:
+        if (recorder := self.recorder) is None:
+            return
+        try:
+            recorder.record(
+                method, path, resp.status_code, time.monotonic() - start, resp.content
+            )
+        except OSError as err:
+            LOGGER.warning("Stopped recording Aquanta trace: %s", err)
+            self.recorder = None
+
+
+def create_client(username: str, password: str) -> Aquanta:
+    """Log into Aquanta and route the client's requests through our helper.
+
+    Must be run in an executor. Raises RuntimeError on invalid credentials.
+    """
+    client = Aquanta(username, password)
+    helper = AquantaApiHelper(client._session, client._timeout)
+    helper.headers = client._helper.headers
+    # Devices are created lazily and pick up the helper from the client
+    client._helper = helper
+    return client
+
+
+def create_transport_client(transport) -> Aquanta:
+    """Return a client whose requests all travel over TRANSPORT.
+
+    Used when another party holds the Aquanta login, so no credentials are
+    sent and the session is never authenticated.
+    """
+    client = Aquanta.__new__(Aquanta)
+    client._timeout = None
+    client._session = None
+    client._devices = None
+    client._helper = AquantaApiHelper(None, None)
+    client._helper.transport = transport
+    return client
+
+
+def device_path(aquanta_id, name: str) -> str:
+    """Return the API path of a device resource."""
+    return f"/v2/devices/{aquanta_id}/{name}"
+
+
+def fetch_device(client: Aquanta, aquanta_id) -> dict[str, Any]:
+    """Fetch the stored payload for a single device.
+
+    The portal has no combined endpoint, so this takes one request per
+    resource, made back to back on the client's keep-alive session.
+    """
+    helper: AquantaApiHelper = client._helper
+    return {
+        "water": helper.get(device_path(aquanta_id, "water"), project_water),
+        "info": helper.get(device_path(aquanta_id, "infocenter"), project_info),
+        "advanced": helper.get(
+            device_path(aquanta_id, "advanced"), project_advanced
+        ),
+    }
+
+
+def reading_sequence(client: Aquanta, aquanta_id) -> int:
+    """Return a number that changes whenever a device's readings are fetched."""
+    return client._helper.fetch_count(device_path(aquanta_id, "water"))
+
+
+def reading_time(client: Aquanta, aquanta_id) -> datetime | None:
+    """Return when a device's current readings were fetched."""
+    return client._helper.fetch_time(device_path(aquanta_id, "water"))
+
+
+def forget_devices(client: Aquanta) -> None:
+    """Make the client list the account's devices again on next use.
+
+    The client keeps the device list it fetched first for as long as it
+    lives, so heaters added to or removed from the account are otherwise
+    never seen.
+    """
+    client._devices = None
+
+
+def invalidate(client: Aquanta, aquanta_id, *names: str) -> None:
+    """Drop a device's cached resources that a command has changed."""
+    client._helper.invalidate(aquanta_id, *names)
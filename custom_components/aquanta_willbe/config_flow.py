@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from typing import Any
-from aquanta import Aquanta
 
 import voluptuous as vol
 
@@ -11,11 +10,28 @@ from homeassistant import config_entries
 from homeassistant import data_entry_flow
 from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
 
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_EXPORT_TELEMETRY,
+    CONF_HEDGE_REQUESTS,
+    CONF_LOCAL_TRANSPORT,
+    CONF_MAX_STALENESS,
+    CONF_PROXY_SERVE,
+    CONF_PROXY_TOKEN,
+    CONF_PROXY_URL,
+    CONF_RECORD_TRACE,
+    DEFAULT_LOCAL_TRANSPORT,
+    DEFAULT_MAX_STALENESS,
+    DOMAIN,
+    LOGGER,
+)
+from .discovery import async_get_discovery_index
+from .executor import RequestPriority, async_get_executor
+from .session import async_store_login, login
 
 
 class AquantaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -23,6 +39,14 @@ class AquantaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> AquantaOptionsFlow:
+        """Get the options flow for this handler."""
+        return AquantaOptionsFlow(config_entry)
+
     async def user_data_schema(self, user_input: dict[str, Any]):
         """Define a shared schema for user credentials."""
         return vol.Schema(
@@ -58,7 +82,10 @@ class AquantaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _errors["base"] = "unknown"
             else:
                 await self.async_set_unique_id(user_input[CONF_USERNAME])
-                self._abort_if_unique_id_configured(updates=user_input)
+                # The entry's update listener swaps the new login in place
+                self._abort_if_unique_id_configured(
+                    updates=user_input, reload_on_update=False
+                )
 
                 return self.async_create_entry(
                     title=user_input[CONF_USERNAME], data=user_input
@@ -87,24 +114,121 @@ class AquantaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self, discovery_info: DhcpServiceInfo
     ) -> data_entry_flow.FlowResult:
         """Handle dhcp discovery."""
-        if len(self._async_current_entries(include_ignore=True)) > 0:
+        index = async_get_discovery_index(self.hass)
+        index.async_add_host(discovery_info)
+
+        if index.async_is_known(discovery_info):
+            raise data_entry_flow.AbortFlow("already_configured")
+
+        if self._async_current_entries(include_ignore=True):
+            index.async_add_mac(discovery_info.macaddress)
             raise data_entry_flow.AbortFlow("already_configured")
 
+        if index.async_debounce(discovery_info):
+            raise data_entry_flow.AbortFlow("already_in_progress")
+
+        # All controllers share one pending discovery flow until it is finished
+        await self.async_set_unique_id(DOMAIN)
+
         return await self.async_step_user()
 
     async def _test_credentials(self, data: dict[str, Any]) -> None:
         """Log into Aquanta to validate the credentials."""
 
         try:
-            await self.hass.async_add_executor_job(
-                Aquanta, data[CONF_USERNAME], data[CONF_PASSWORD]
+            client = await async_get_executor(self.hass).async_run(
+                login,
+                data[CONF_USERNAME],
+                data[CONF_PASSWORD],
+                priority=RequestPriority.INTERACTIVE,
             )
         except RuntimeError:
             raise AquantaInvalidAuth from RuntimeError
 
+        # Setup runs right after the flow finishes; let it reuse this session
+        async_store_login(self.hass, data[CONF_USERNAME], data[CONF_PASSWORD], client)
+
         return {"title": data[CONF_USERNAME], "data": data}
 
 
+class AquantaOptionsFlow(config_entries.OptionsFlow):
+    """Handle Aquanta options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_STALENESS,
+                        default=self._entry.options.get(
+                            CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=1440,
+                            unit_of_measurement="min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_LOCAL_TRANSPORT,
+                        default=self._entry.options.get(
+                            CONF_LOCAL_TRANSPORT, DEFAULT_LOCAL_TRANSPORT
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_HEDGE_REQUESTS,
+                        default=self._entry.options.get(CONF_HEDGE_REQUESTS, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_RECORD_TRACE,
+                        default=self._entry.options.get(CONF_RECORD_TRACE, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_EXPORT_TELEMETRY,
+                        default=self._entry.options.get(CONF_EXPORT_TELEMETRY, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_PROXY_SERVE,
+                        default=self._entry.options.get(CONF_PROXY_SERVE, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_PROXY_URL,
+                        description={
+                            "suggested_value": self._entry.options.get(CONF_PROXY_URL)
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                    ),
+                    vol.Optional(
+                        CONF_PROXY_TOKEN,
+                        description={
+                            "suggested_value": self._entry.options.get(
+                                CONF_PROXY_TOKEN
+                            )
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.PASSWORD
+                        )
+                    ),
+                }
+            ),
+        )
+
+
 class AquantaCannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -8,3 +8,24 @@ NAME = "Aquanta Willbe"
 DOMAIN = "aquanta_willbe"
 MODEL = "Aquanta Water Heater Controller with Temp"
 ATTRIBUTION = ""
+
+# Key in hass.data for authenticated sessions handed off by the config flow
+DATA_LOGINS = f"{DOMAIN}_logins"
+
+# Options
+CONF_MAX_STALENESS = "max_staleness"
+DEFAULT_MAX_STALENESS = 10  # minutes, 0 disables serving stale data
+CONF_RECORD_TRACE = "record_trace"
+CONF_LOCAL_TRANSPORT = "local_transport"
+DEFAULT_LOCAL_TRANSPORT = False
+CONF_PROXY_SERVE = "proxy_serve"
+CONF_PROXY_URL = "proxy_url"
+CONF_PROXY_TOKEN = "proxy_token"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_EXPORT_TELEMETRY = "export_telemetry"
+
+# Key in hass.data for the thread pool running blocking Aquanta calls
+DATA_EXECUTOR = f"{DOMAIN}_executor"
+
+# Key in hass.data for the index of already discovered controllers
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
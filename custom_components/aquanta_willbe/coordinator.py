@@ -2,17 +2,83 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime, timedelta
+import math
+import time
+from typing import Any
+
 import async_timeout
+import requests
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util, slugify
+
+from .aggregate import FleetAggregate
+from .api import fetch_device, forget_devices, reading_sequence, reading_time
+from .const import (
+    CONF_EXPORT_TELEMETRY,
+    CONF_HEDGE_REQUESTS,
+    CONF_LOCAL_TRANSPORT,
+    CONF_MAX_STALENESS,
+    CONF_PROXY_SERVE,
+    CONF_RECORD_TRACE,
+    DEFAULT_LOCAL_TRANSPORT,
+    DEFAULT_MAX_STALENESS,
+    DOMAIN,
+    LOGGER,
+    MODEL,
+    NAME,
+)
+from .discovery import async_get_discovery_index
+from .executor import (
+    MAX_WORKERS,
+    AquantaBusyError,
+    RequestPriority,
+    async_get_executor,
+)
+from .export import TelemetryExporter, export_available
+from .hedge import RequestHedger
+from .history import ReadingHistory
+from .thermal import ThermalEstimator
+from .trace import TraceRecorder
+from .transport import CloudTransport, LocalTransport
+
+UPDATE_INTERVAL = timedelta(seconds=60)
+
+# Revalidation backoff while serving stale data
+RETRY_INTERVAL_MIN = timedelta(seconds=15)
+RETRY_INTERVAL_MAX = timedelta(minutes=5)
+
+# Poll interval bounds while the thermal estimates stay accurate
+POLL_INTERVAL_MIN = timedelta(seconds=30)
+POLL_INTERVAL_MAX = timedelta(minutes=3)
+
+# Estimated temperature error (°C) that makes another poll worthwhile
+ESTIMATE_TOLERANCE = 1.0
+
+# How often interpolated values are published between polls
+ESTIMATE_INTERVAL = timedelta(seconds=15)
 
-from .const import DOMAIN, LOGGER
+# Device fetches one refresh keeps in flight
+FETCH_CONCURRENCY = MAX_WORKERS
+
+# Time a refresh may take, or a few seconds per round of device fetches on
+# accounts too large to fetch in one
+REFRESH_TIMEOUT = 10
+ROUND_TIMEOUT = 3
+
+# How often the account's device list is fetched again
+INVENTORY_INTERVAL = timedelta(hours=1)
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -21,33 +87,440 @@ class AquantaCoordinator(DataUpdateCoordinator):
 
     config_entry: ConfigEntry
 
-    def __init__(self, hass: HomeAssistant, aquanta, account_id) -> None:
+    def __init__(self, hass: HomeAssistant, aquanta, account_id, password) -> None:
         """Initialize the coordinator."""
         self.aquanta = aquanta
         self.account_id = account_id
+        self.password = password
+        self._known_devices: set = set()
+        # When the cached device list is next refreshed (monotonic seconds)
+        self._inventory_expires = 0.0
+        self._schedule_inventory()
+        self._device_info: dict[Any, DeviceInfo] = {}
+        self.account_device_info = DeviceInfo(
+            identifiers={(DOMAIN, account_id)},
+            manufacturer=NAME,
+            name=f"Aquanta account {account_id}",
+        )
+        self._device_listeners: list[Callable[[Iterable], None]] = []
+        self.max_staleness = timedelta(minutes=DEFAULT_MAX_STALENESS)
+        self.last_success_time: datetime | None = None
+        self.stale = False
+        self._failures = 0
+        self.thermal: dict[Any, ThermalEstimator] = {}
+        self.history: dict[Any, ReadingHistory] = {}
+        # Reading sequence of the last reading fed to each device's models
+        self._recorded: dict[Any, int] = {}
+        self.fleet = FleetAggregate()
+        self._estimate_listeners: list[CALLBACK_TYPE] = []
+        self._unsub_estimates: CALLBACK_TYPE | None = None
+        self.executor = async_get_executor(hass)
+        self._priority = RequestPriority.BACKGROUND
+        self.recorder: TraceRecorder | None = None
+        self.hedger: RequestHedger | None = None
+        self.exporter: TelemetryExporter | None = None
+        self.local_transport = DEFAULT_LOCAL_TRANSPORT
+        self.proxy_serve = False
+        # URL and token of the instance this one reads through, if any
+        self.proxy_options: tuple[str | None, str | None] = (None, None)
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=60),
+            update_interval=UPDATE_INTERVAL,
+        )
+        # Platforms are set up before the first refresh and add entities as
+        # devices arrive
+        self.data = {"id": account_id, "devices": {}}
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """Return how long ago the current data was fetched."""
+        if self.last_success_time is None:
+            return None
+        return dt_util.utcnow() - self.last_success_time
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the config entry options."""
+        self.max_staleness = timedelta(
+            minutes=int(options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS))
+        )
+
+        self.local_transport = options.get(
+            CONF_LOCAL_TRANSPORT, DEFAULT_LOCAL_TRANSPORT
+        )
+        self.proxy_serve = options.get(CONF_PROXY_SERVE, False)
+
+        if options.get(CONF_RECORD_TRACE, False):
+            if self.recorder is None:
+                self.recorder = TraceRecorder(
+                    self.hass.config.path(
+                        f"{DOMAIN}_{slugify(self.account_id)}.trace.jsonl"
+                    )
+                )
+                LOGGER.info("Recording Aquanta API trace to %s", self.recorder.path)
+        else:
+            self.async_stop_recording()
+
+        if not options.get(CONF_HEDGE_REQUESTS, False):
+            self.async_stop_hedging()
+        elif self.hedger is None:
+            self.hedger = RequestHedger()
+
+        if not options.get(CONF_EXPORT_TELEMETRY, False):
+            self.async_stop_exporting()
+        elif self.exporter is None:
+            if not export_available():
+                LOGGER.error(
+                    "Exporting Aquanta telemetry needs the pyarrow package, "
+                    "which is not installed"
+                )
+            else:
+                self.exporter = TelemetryExporter(
+                    self.hass.config.path(f"{DOMAIN}_export", slugify(self.account_id))
+                )
+                LOGGER.info(
+                    "Exporting Aquanta telemetry to %s", self.exporter.directory
+                )
+        self._configure_helper()
+
+    @callback
+    def async_stop_recording(self) -> None:
+        """Stop recording and close the trace file."""
+        if (recorder := self.recorder) is None:
+            return
+        self.recorder = None
+        self._configure_helper()
+        self.hass.async_add_executor_job(recorder.close)
+
+    @callback
+    def async_stop_hedging(self) -> None:
+        """Stop hedging reads and release the hedging threads."""
+        if (hedger := self.hedger) is None:
+            return
+        self.hedger = None
+        self._configure_helper()
+        hedger.shutdown()
+
+    @callback
+    def async_stop_exporting(self) -> None:
+        """Write the remaining rows and finish the export file."""
+        if (exporter := self.exporter) is None:
+            return
+        self.exporter = None
+        self.hass.async_add_executor_job(exporter.close, exporter.take())
+
+    def _configure_helper(self) -> None:
+        """Apply the recorder, hedging and transport options to the helper."""
+        if (helper := getattr(self.aquanta, "_helper", None)) is None:
+            return
+        helper.recorder = self.recorder
+        helper.hedger = self.hedger
+
+        transport = getattr(helper, "transport", None)
+        cloud = transport.cloud if isinstance(transport, LocalTransport) else transport
+        if not isinstance(cloud, CloudTransport):
+            return
+        if not self.local_transport:
+            helper.transport = cloud
+        elif not isinstance(transport, LocalTransport):
+            helper.transport = LocalTransport(
+                cloud, async_get_discovery_index(self.hass).hosts
+            )
+
+    @callback
+    def async_set_client(self, aquanta, password) -> None:
+        """Swap in a freshly authenticated client without reloading."""
+        self.aquanta = aquanta
+        self.password = password
+        self._schedule_inventory()
+        self._configure_helper()
+
+    def _schedule_inventory(self) -> None:
+        """Keep a device list the client was handed with until it is due."""
+        if getattr(self.aquanta, "_devices", None):
+            # Just enumerated by the login, e.g. the config flow's
+            self._inventory_expires = (
+                time.monotonic() + INVENTORY_INTERVAL.total_seconds()
+            )
+        else:
+            self._inventory_expires = 0.0
+
+    def device_unique_id(self, aquanta_id) -> str:
+        """Return the unique ID prefix shared by a device and its entities."""
+        return f"{self.account_id}_{aquanta_id}"
+
+    def device_info(self, aquanta_id) -> DeviceInfo:
+        """Return the registry info of a device, shared by all its entities."""
+        if (info := self._device_info.get(aquanta_id)) is None:
+            info = self._device_info[aquanta_id] = DeviceInfo(
+                identifiers={(DOMAIN, self.device_unique_id(aquanta_id))},
+                manufacturer=NAME,
+                model=MODEL,
+                name=self.data["devices"][aquanta_id]["info"]["title"],
+            )
+        return info
+
+    @callback
+    def async_add_device_listener(
+        self, add_devices: Callable[[Iterable], None]
+    ) -> CALLBACK_TYPE:
+        """Add entities for the known devices now and for new devices later."""
+        self._known_devices.update(self.data["devices"])
+        self._device_listeners.append(add_devices)
+        add_devices(list(self._known_devices))
+
+        @callback
+        def remove_listener() -> None:
+            self._device_listeners.remove(add_devices)
+
+        return remove_listener
+
+    @callback
+    def async_add_estimate_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call update_callback periodically to publish interpolated values."""
+        self._estimate_listeners.append(update_callback)
+
+        if self._unsub_estimates is None:
+            self._unsub_estimates = async_track_time_interval(
+                self.hass, self._async_publish_estimates, ESTIMATE_INTERVAL
+            )
+
+        @callback
+        def remove_listener() -> None:
+            self._estimate_listeners.remove(update_callback)
+            if not self._estimate_listeners and self._unsub_estimates is not None:
+                self._unsub_estimates()
+                self._unsub_estimates = None
+
+        return remove_listener
+
+    @callback
+    def _async_publish_estimates(self, _now: datetime) -> None:
+        if self.stale or not self.last_update_success:
+            return
+        for update_callback in list(self._estimate_listeners):
+            update_callback()
+
+    def estimated_temperature(self, aquanta_id) -> float | None:
+        """Return the tank temperature interpolated since the last poll."""
+        estimator = self.thermal.get(aquanta_id)
+        if estimator is None or self.stale:
+            return self.data["devices"][aquanta_id]["water"]["temperature"]
+        estimate = estimator.predict_temperature(time.monotonic())
+        return None if estimate is None else round(estimate, 1)
+
+    def estimated_available(self, aquanta_id) -> float | None:
+        """Return the hot water availability interpolated since the last poll."""
+        estimator = self.thermal.get(aquanta_id)
+        if estimator is None or self.stale:
+            return self.data["devices"][aquanta_id]["water"]["available"]
+        return estimator.predict_available(time.monotonic())
+
+    def reading_sequence(self, aquanta_id) -> int | None:
+        """Return the sequence of the device's last reading fed to its models."""
+        return self._recorded.get(aquanta_id)
+
+    def _record_readings(self, data) -> list:
+        """Feed fresh readings to the estimators, histories and fleet totals.
+
+        Returns the devices whose readings were fetched in this refresh.
+        """
+        now = time.monotonic()
+        fresh = []
+
+        for aquanta_id in set(self.thermal) - set(data["devices"]):
+            self.thermal.pop(aquanta_id)
+            self.history.pop(aquanta_id, None)
+            self._recorded.pop(aquanta_id, None)
+            self.fleet.remove(aquanta_id)
+
+        for aquanta_id, device in data["devices"].items():
+            self.fleet.update(aquanta_id, device)
+            sequence = reading_sequence(self.aquanta, aquanta_id)
+            if self._recorded.get(aquanta_id) == sequence:
+                # Served from the response cache, not a new reading
+                continue
+            self._recorded[aquanta_id] = sequence
+            fresh.append(aquanta_id)
+            water = device["water"]
+            advanced = device["advanced"]
+            self.thermal.setdefault(aquanta_id, ThermalEstimator()).update(
+                water["temperature"],
+                water["available"],
+                now,
+                advanced["setPoint"] if advanced["thermostatEnabled"] else None,
+            )
+            self.history.setdefault(aquanta_id, ReadingHistory()).append(
+                now, water["temperature"], water["available"]
+            )
+        return fresh
+
+    def _export(self, data, fresh: list) -> None:
+        """Add FRESH devices' readings to the export, writing batches off the loop."""
+        if (exporter := self.exporter) is None:
+            return
+        batch = exporter.append(
+            (
+                reading_time(self.aquanta, aquanta_id) or self.last_success_time,
+                aquanta_id,
+                data["devices"][aquanta_id],
+            )
+            for aquanta_id in fresh
         )
+        if batch is not None:
+            self.hass.async_add_executor_job(exporter.write, batch)
+
+    def _poll_interval(self) -> timedelta:
+        """Poll again when the least accurate estimate is expected to drift."""
+        horizons = [
+            estimator.seconds_until_error(ESTIMATE_TOLERANCE)
+            for estimator in self.thermal.values()
+        ]
+
+        if not horizons or None in horizons:
+            return UPDATE_INTERVAL
+
+        return min(
+            max(timedelta(seconds=min(horizons)), POLL_INTERVAL_MIN),
+            POLL_INTERVAL_MAX,
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Sync the device set before updating entities."""
+        self._async_sync_devices()
+        super().async_update_listeners()
+
+    @callback
+    def _async_sync_devices(self) -> None:
+        """Add entities for new devices and remove the ones that disappeared."""
+        current = set(self.data["devices"])
+        added = current - self._known_devices
+        removed = self._known_devices - current
+        self._known_devices = current
+        for aquanta_id in removed:
+            self._device_info.pop(aquanta_id, None)
 
-    def get_device_data(self):
+        if added:
+            LOGGER.debug("New Aquanta devices found: %s", added)
+            async_get_discovery_index(self.hass).async_add_devices(added)
+            for add_devices in self._device_listeners:
+                add_devices(list(added))
+
+        if removed and self.config_entry is not None:
+            LOGGER.debug("Aquanta devices removed: %s", removed)
+            device_registry = dr.async_get(self.hass)
+            for aquanta_id in removed:
+                device = device_registry.async_get_device(
+                    identifiers={(DOMAIN, self.device_unique_id(aquanta_id))}
+                )
+                if device is not None:
+                    device_registry.async_update_device(
+                        device.id, remove_config_entry_id=self.config_entry.entry_id
+                    )
+
+    async def async_request_verify(self) -> None:
+        """Request a refresh that reads back the result of a user command."""
+        self._priority = RequestPriority.VERIFY
+        await self.async_request_refresh()
+
+    async def async_get_device_data(self):
         """Get all data from the Aquanta API for each device."""
-        data = {"id": self.account_id, "devices": {}}
+        priority, self._priority = self._priority, RequestPriority.BACKGROUND
+        if (now := time.monotonic()) >= self._inventory_expires:
+            # Devices added or removed since are picked up by this refresh
+            # and synced by async_update_listeners
+            forget_devices(self.aquanta)
+            self._inventory_expires = now + INVENTORY_INTERVAL.total_seconds()
+        aquanta_ids = await self.executor.async_run(
+            lambda: list(self.aquanta.devices()), priority=priority
+        )
 
-        for aquanta_id in self.aquanta.devices():
-            data["devices"][aquanta_id] = {
-                "water": self.aquanta[aquanta_id].water,
-                "info": self.aquanta[aquanta_id].infocenter,
-                "advanced": self.aquanta[aquanta_id].advanced,
-            }
+        # Until the first refresh succeeds, add each device's entities as soon
+        # as its data arrives instead of waiting for the slowest device
+        progressive = self.last_success_time is None
+        devices = self.data["devices"] if progressive else {}
 
-        return data
+        # A fixed number of fetches in flight, so large accounts queue here
+        # instead of filling the executor's queue
+        pending = iter(aquanta_ids)
+
+        async def _async_fetch() -> None:
+            for aquanta_id in pending:
+                devices[aquanta_id] = await self.executor.async_run(
+                    fetch_device, self.aquanta, aquanta_id, priority=priority
+                )
+                if progressive:
+                    self._async_sync_devices()
+
+        tasks = [
+            asyncio.create_task(_async_fetch())
+            for _ in range(min(FETCH_CONCURRENCY, len(aquanta_ids)))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return {
+            "id": self.account_id,
+            "devices": {aquanta_id: devices[aquanta_id] for aquanta_id in aquanta_ids},
+        }
 
     async def _async_update_data(self):
         try:
-            async with async_timeout.timeout(10):
-                return await self.hass.async_add_executor_job(self.get_device_data)
-        except RuntimeError as exception:
+            rounds = math.ceil(len(self._known_devices) / FETCH_CONCURRENCY)
+            async with async_timeout.timeout(
+                max(REFRESH_TIMEOUT, ROUND_TIMEOUT * rounds)
+            ):
+                data = await self.async_get_device_data()
+        except (
+            RuntimeError,
+            requests.RequestException,
+            AquantaBusyError,
+            asyncio.TimeoutError,
+        ) as exception:
+            return self._serve_stale(exception)
+
+        if self.stale:
+            LOGGER.info("Aquanta cloud is reachable again, data is fresh")
+
+        self._failures = 0
+        self.stale = False
+        self.last_success_time = dt_util.utcnow()
+        self._export(data, self._record_readings(data))
+        self.update_interval = self._poll_interval()
+        return data
+
+    def _serve_stale(self, exception: Exception):
+        """Keep serving the last good data until it is too old."""
+        # A device removed from the account fails every fetch until the
+        # device list is refreshed, so do not wait for the schedule
+        self._inventory_expires = 0.0
+        age = self.data_age
+
+        if age is None or age > self.max_staleness:
+            self._failures = 0
+            self.stale = False
+            self.update_interval = UPDATE_INTERVAL
             raise UpdateFailed(exception) from exception
+
+        if not self.stale:
+            LOGGER.warning(
+                "Error fetching Aquanta data, serving data from %s ago: %s",
+                age,
+                exception,
+            )
+
+        self._failures += 1
+        self.stale = True
+        self.update_interval = min(
+            RETRY_INTERVAL_MIN * 2 ** (self._failures - 1), RETRY_INTERVAL_MAX
+        )
+        return self.data
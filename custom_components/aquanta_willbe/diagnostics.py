@@ -0,0 +1,40 @@
+"""Diagnostics support for Aquanta."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PROXY_TOKEN, DOMAIN
+from .coordinator import AquantaCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, CONF_PROXY_TOKEN, "id", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: AquantaCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.stale,
+            "update_interval": str(coordinator.update_interval),
+            "devices": len(coordinator.data["devices"]),
+        },
+        "executor": dict(coordinator.executor.stats),
+        "cache": dict(coordinator.aquanta._helper.stats),
+        "transport": {
+            "name": (transport := coordinator.aquanta._helper.transport).name,
+            **getattr(transport, "stats", {}),
+        },
+        "hedging": dict(coordinator.hedger.stats) if coordinator.hedger else None,
+        "export": dict(coordinator.exporter.stats) if coordinator.exporter else None,
+    }
@@ -0,0 +1,79 @@
+"""Index of Aquanta controllers seen through DHCP discovery."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import timedelta
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
+
+from .const import DATA_DISCOVERY
+
+HOSTNAME_PREFIX = "aquanta-"
+
+# Lease renewals from the same controller within this window are ignored
+DISCOVERY_DEBOUNCE = timedelta(hours=1)
+
+
+class DiscoveryIndex:
+    """Cheap lookups that let DHCP discovery skip controllers it already knows."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.known_macs: set[str] = set()
+        self.known_ids: set[str] = set()
+        # LAN address of each discovered controller, by device ID
+        self.hosts: dict[str, str] = {}
+        self._last_seen: dict[str, float] = {}
+
+    @callback
+    def async_add_devices(self, aquanta_ids: Iterable) -> None:
+        """Remember the device IDs of a configured account."""
+        self.known_ids.update(str(aquanta_id).lower() for aquanta_id in aquanta_ids)
+
+    @callback
+    def async_add_mac(self, macaddress: str) -> None:
+        """Remember a controller that belongs to a configured account."""
+        self.known_macs.add(format_mac(macaddress))
+
+    @callback
+    def async_add_host(self, discovery_info: DhcpServiceInfo) -> None:
+        """Remember the address a controller was last seen at."""
+        hostname = discovery_info.hostname.lower()
+        if hostname.startswith(HOSTNAME_PREFIX):
+            self.hosts[hostname.removeprefix(HOSTNAME_PREFIX)] = discovery_info.ip
+
+    @callback
+    def async_is_known(self, discovery_info: DhcpServiceInfo) -> bool:
+        """Return true if the controller belongs to a configured account."""
+        if format_mac(discovery_info.macaddress) in self.known_macs:
+            return True
+
+        hostname = discovery_info.hostname.lower()
+        return hostname.removeprefix(HOSTNAME_PREFIX) in self.known_ids
+
+    @callback
+    def async_debounce(self, discovery_info: DhcpServiceInfo) -> bool:
+        """Return true if the controller was already seen recently."""
+        mac = format_mac(discovery_info.macaddress)
+        now = time.monotonic()
+        last_seen = self._last_seen.get(mac)
+
+        window = DISCOVERY_DEBOUNCE.total_seconds()
+
+        if last_seen is not None and now - last_seen < window:
+            return True
+
+        self._last_seen[mac] = now
+        return False
+
+
+@callback
+def async_get_discovery_index(hass: HomeAssistant) -> DiscoveryIndex:
+    """Return the discovery index, creating it on first use."""
+    if (index := hass.data.get(DATA_DISCOVERY)) is None:
+        index = hass.data[DATA_DISCOVERY] = DiscoveryIndex()
+    return index
@@ -3,37 +3,111 @@
 from __future__ import annotations
 
 from datetime import timedelta, datetime, timezone
+from typing import Any
 
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, EntityDescription
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
 )
 
-from .const import ATTRIBUTION, DOMAIN, MODEL, NAME
+from .api import invalidate
+from .const import ATTRIBUTION
 from .coordinator import AquantaCoordinator
+from .executor import RequestPriority
+from .payload import mode_active
 
 
 class AquantaEntity(CoordinatorEntity):
-    """Defines a main class for an Aquanta entity."""
+    """Defines a main class for an Aquanta entity.
 
-    _attr_attribution = ATTRIBUTION
+    Accounts can have thousands of devices, so entities keep only their
+    device ID and description. The description is shared by every entity of
+    its kind and the device info is cached by the coordinator.
+    """
 
-    def __init__(self, coordinator: AquantaCoordinator, aquanta_id) -> None:
+    _attr_attribution = ATTRIBUTION
+    _attr_has_entity_name = True
+    _written_payloads: tuple = ()
+    _written_status: tuple[bool, bool] | None = None
+    _written_sequence: int | None = None
+
+    def __init__(
+        self,
+        coordinator: AquantaCoordinator,
+        aquanta_id,
+        entity_description: EntityDescription | None = None,
+    ) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
-        self._base_unique_id = f"{coordinator.data['id']}_{aquanta_id}"
         self.aquanta_id = aquanta_id
-        self._api = coordinator.aquanta
+        if entity_description is not None:
+            self.entity_description = entity_description
+            self._attr_unique_id = f"{self._base_unique_id}_{entity_description.key}"
+
+    @property
+    def _base_unique_id(self) -> str:
+        """Return the unique ID prefix of this entity's device."""
+        return self.coordinator.device_unique_id(self.aquanta_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the state write when nothing this entity shows has changed.
+
+        The HTTP layer hands back the same payload objects for resources that
+        did not change, so comparing identities is enough for the readings.
+        Values derived from the reading history still move with every fetch,
+        so a new reading is always written even if its payload is unchanged.
+        """
+        device = self.coordinator.data["devices"].get(self.aquanta_id)
+        payloads = tuple(device.values()) if device else ()
+        status = (self.coordinator.last_update_success, self.coordinator.stale)
+        sequence = self.coordinator.reading_sequence(self.aquanta_id)
+
+        if (
+            not self.coordinator.stale
+            and status == self._written_status
+            and sequence == self._written_sequence
+            and len(payloads) == len(self._written_payloads)
+            and all(
+                payload is written
+                for payload, written in zip(payloads, self._written_payloads)
+            )
+        ):
+            return
+
+        self._written_payloads = payloads
+        self._written_status = status
+        self._written_sequence = sequence
+        super()._handle_coordinator_update()
+
+    @property
+    def _api(self):
+        """Return the coordinator's current Aquanta client."""
+        return self.coordinator.aquanta
+
+    @property
+    def available(self) -> bool:
+        """Return true while the device is still part of the account."""
+        return (
+            super().available
+            and self.aquanta_id in self.coordinator.data["devices"]
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Tell automations when the values are from an earlier refresh."""
+        attributes: dict[str, Any] = {"stale": self.coordinator.stale}
+
+        if self.coordinator.stale and (age := self.coordinator.data_age) is not None:
+            attributes["data_age"] = int(age.total_seconds())
+
+        return attributes
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return info for device registry."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._base_unique_id)},
-            manufacturer=NAME,
-            model=MODEL,
-            name=self.coordinator.data["devices"][self.aquanta_id]["info"]["title"],
-        )
+        return self.coordinator.device_info(self.aquanta_id)
 
     def device_name(self):
         """Get the device name from the latest API request."""
@@ -42,35 +116,30 @@ class AquantaEntity(CoordinatorEntity):
     @property
     def is_away_mode_on(self):
         """Return true if away mode is on."""
-        on_value = (
-            self.coordinator.data["devices"][self.aquanta_id]["info"]["currentMode"][
-                "type"
-            ]
-            == "away"
+        return mode_active(
+            self.coordinator.data["devices"][self.aquanta_id]["info"], "away"
         )
 
-        if not on_value:
-            for record in self.coordinator.data["devices"][self.aquanta_id]["info"][
-                "records"
-            ]:
-                if record["type"] == "away" and record["state"] == "ongoing":
-                    on_value = True
-                    break
-
-        return on_value
-
     async def async_turn_away_mode_on(self):
         """Turn away mode on."""
         schedule = self.get_away_schedule()
-        await self.hass.async_add_executor_job(
-            self._api[self.aquanta_id].set_away, schedule["start"], schedule["stop"]
+        await self.coordinator.executor.async_run(
+            self._api[self.aquanta_id].set_away,
+            schedule["start"],
+            schedule["stop"],
+            priority=RequestPriority.INTERACTIVE,
         )
-        await self.coordinator.async_request_refresh()
+        invalidate(self._api, self.aquanta_id, "infocenter")
+        await self.coordinator.async_request_verify()
 
     async def async_turn_away_mode_off(self):
         """Turn away mode off."""
-        await self.hass.async_add_executor_job(self._api[self.aquanta_id].delete_away)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.executor.async_run(
+            self._api[self.aquanta_id].delete_away,
+            priority=RequestPriority.INTERACTIVE,
+        )
+        invalidate(self._api, self.aquanta_id, "infocenter")
+        await self.coordinator.async_request_verify()
 
     def get_away_schedule(self):
         """Get a schedule in the correct format for enabling Away mode."""
@@ -86,35 +155,30 @@ class AquantaEntity(CoordinatorEntity):
     @property
     def is_boost_mode_on(self):
         """Return true if boost mode is on."""
-        on_value = (
-            self.coordinator.data["devices"][self.aquanta_id]["info"]["currentMode"][
-                "type"
-            ]
-            == "boost"
+        return mode_active(
+            self.coordinator.data["devices"][self.aquanta_id]["info"], "boost"
         )
 
-        if not on_value:
-            for record in self.coordinator.data["devices"][self.aquanta_id]["info"][
-                "records"
-            ]:
-                if record["type"] == "boost" and record["state"] == "ongoing":
-                    on_value = True
-                    break
-
-        return on_value
-
     async def async_turn_boost_mode_on(self, **kwargs):
         """Turn on boost mode."""
         schedule = self.get_boost_schedule()
-        await self.hass.async_add_executor_job(
-            self._api[self.aquanta_id].set_boost, schedule["start"], schedule["stop"]
+        await self.coordinator.executor.async_run(
+            self._api[self.aquanta_id].set_boost,
+            schedule["start"],
+            schedule["stop"],
+            priority=RequestPriority.INTERACTIVE,
         )
-        await self.coordinator.async_request_refresh()
+        invalidate(self._api, self.aquanta_id, "infocenter")
+        await self.coordinator.async_request_verify()
 
     async def async_turn_boost_mode_off(self, **kwargs):
         """Turn off boost mode."""
-        await self.hass.async_add_executor_job(self._api[self.aquanta_id].delete_boost)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.executor.async_run(
+            self._api[self.aquanta_id].delete_boost,
+            priority=RequestPriority.INTERACTIVE,
+        )
+        invalidate(self._api, self.aquanta_id, "infocenter")
+        await self.coordinator.async_request_verify()
 
     def get_boost_schedule(self):
         """Get a schedule in the correct format for enabling Boost mode."""
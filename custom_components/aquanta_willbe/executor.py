@@ -0,0 +1,258 @@
+"""Bounded, prioritized thread pool for blocking Aquanta calls."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from functools import partial
+import heapq
+import itertools
+import time
+from typing import Any, TypeVar
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DATA_EXECUTOR, LOGGER
+
+_T = TypeVar("_T")
+
+MAX_WORKERS = 4
+
+# Calls allowed to wait for a worker before new ones are rejected
+MAX_QUEUED = 64
+
+# Further places in the queue only user commands may take
+INTERACTIVE_RESERVE = 16
+
+
+class RequestPriority(IntEnum):
+    """Priority classes for Aquanta calls, most urgent first."""
+
+    INTERACTIVE = 0
+    VERIFY = 1
+    BACKGROUND = 2
+
+
+class AquantaBusyError(HomeAssistantError):
+    """Error to indicate too many Aquanta calls are already waiting."""
+
+
+class AquantaExecutor:
+    """Schedule every Aquanta call on a pool separate from Home Assistant's.
+
+    A slow cloud then only ties up these threads. Waiting calls start in
+    priority order: user commands, then the reads verifying them, then
+    background polling. Background calls never take the last free worker
+    and are held back entirely while any user command is pending, so a
+    command issued during a fleet-wide refresh only waits for the device
+    fetches already in flight. Calls still waiting when their awaiting task
+    is cancelled (for example by the coordinator's timeout) never run.
+    """
+
+    def __init__(
+        self, max_workers: int = MAX_WORKERS, max_queued: int = MAX_QUEUED
+    ) -> None:
+        """Initialize the pool."""
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="aquanta")
+        self._max_workers = max_workers
+        self._max_background = max(max_workers - 1, 1)
+        self._limit = max_workers + max_queued
+        self._pending = 0
+        self._running = 0
+        self._running_background = 0
+        self._interactive = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self.stats: dict[str, Any] = {
+            "max_workers": max_workers,
+            "max_queued": max_queued,
+            "pending": 0,
+            "completed": 0,
+            "rejected": 0,
+            "cancelled": 0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": {
+                priority.name.lower(): 0.0 for priority in RequestPriority
+            },
+        }
+
+    async def async_run(
+        self,
+        func: Callable[..., _T],
+        *args: Any,
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+    ) -> _T:
+        """Run func(*args) on the pool and return its result.
+
+        A call that is already running when the awaiting task is cancelled
+        keeps its worker slot until the thread returns, so the slots always
+        match the threads actually busy.
+        """
+        await self._async_enter(priority)
+        try:
+            future = self._pool.submit(func, *args)
+        except BaseException:
+            self._async_done(priority, started=True)
+            raise
+
+        wrapped = asyncio.wrap_future(future)
+        try:
+            result = await asyncio.shield(wrapped)
+        except asyncio.CancelledError:
+            # Calls that have not started yet never will, the others keep
+            # their slot until they return
+            future.cancel()
+            wrapped.add_done_callback(partial(self._async_release, priority))
+            raise
+        except BaseException:
+            self._async_done(priority, started=True)
+            raise
+
+        self.stats["completed"] += 1
+        self._async_done(priority, started=True)
+        return result
+
+    @callback
+    def _async_release(
+        self, priority: RequestPriority, wrapped: asyncio.Future
+    ) -> None:
+        """Give back the slot of a cancelled call once its thread is done."""
+        if not wrapped.cancelled():
+            # Nobody awaits the result any more
+            wrapped.exception()
+        self._async_done(priority, started=True)
+
+    @asynccontextmanager
+    async def async_slot(
+        self, priority: RequestPriority = RequestPriority.BACKGROUND
+    ) -> AsyncIterator[None]:
+        """Hold a worker slot, for Aquanta calls that are already async."""
+        await self._async_enter(priority)
+        try:
+            yield
+            self.stats["completed"] += 1
+        finally:
+            self._async_done(priority, started=True)
+
+    async def _async_enter(self, priority: RequestPriority) -> None:
+        """Queue a call and wait until it may start.
+
+        Calls beyond the queue limit are rejected, except that the last
+        INTERACTIVE_RESERVE places are kept for user commands, so a command
+        is accepted even while polling has filled the queue.
+        """
+        limit = self._limit
+        if priority is RequestPriority.INTERACTIVE:
+            limit += INTERACTIVE_RESERVE
+        if self._pending >= limit:
+            self.stats["rejected"] += 1
+            raise AquantaBusyError(
+                f"Too many Aquanta calls waiting ({self._pending}), try again later"
+            )
+
+        queued = time.monotonic()
+        self._pending += 1
+        self.stats["pending"] = self._pending
+        if priority is RequestPriority.INTERACTIVE:
+            self._interactive += 1
+
+        try:
+            await self._async_acquire(priority)
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            self._async_done(priority, started=False)
+            raise
+
+        wait = time.monotonic() - queued
+        name = priority.name.lower()
+        self.stats["queue_wait_total"] += wait
+        self.stats["queue_wait_max"][name] = max(
+            self.stats["queue_wait_max"][name], wait
+        )
+
+    def _can_start(self, priority: RequestPriority) -> bool:
+        if self._running >= self._max_workers:
+            return False
+        if priority is RequestPriority.BACKGROUND:
+            return (
+                self._interactive == 0
+                and self._running_background < self._max_background
+            )
+        return True
+
+    def _async_start(self, priority: RequestPriority) -> None:
+        self._running += 1
+        if priority is RequestPriority.BACKGROUND:
+            self._running_background += 1
+
+    async def _async_acquire(self, priority: RequestPriority) -> None:
+        """Wait until the call may start."""
+        if not self._waiters and self._can_start(priority):
+            self._async_start(priority)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self._async_wake()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Woken right before being cancelled, give the slot back
+                self._async_done(priority, started=True, pending=False)
+            raise
+
+    @callback
+    def _async_done(
+        self, priority: RequestPriority, started: bool, pending: bool = True
+    ) -> None:
+        if pending:
+            self._pending -= 1
+            self.stats["pending"] = self._pending
+            if priority is RequestPriority.INTERACTIVE:
+                self._interactive -= 1
+        if started:
+            self._running -= 1
+            if priority is RequestPriority.BACKGROUND:
+                self._running_background -= 1
+        self._async_wake()
+
+    @callback
+    def _async_wake(self) -> None:
+        """Start waiting calls in priority order while workers are free."""
+        while self._waiters:
+            priority, _, waiter = self._waiters[0]
+            if waiter.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._can_start(RequestPriority(priority)):
+                return
+            heapq.heappop(self._waiters)
+            self._async_start(RequestPriority(priority))
+            waiter.set_result(None)
+
+    def shutdown(self) -> None:
+        """Stop the pool, dropping calls that have not started."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@callback
+def async_get_executor(hass: HomeAssistant) -> AquantaExecutor:
+    """Return the integration's executor, creating it on first use."""
+    if (executor := hass.data.get(DATA_EXECUTOR)) is None:
+        executor = hass.data[DATA_EXECUTOR] = AquantaExecutor()
+
+        @callback
+        def _async_shutdown(_event: Event) -> None:
+            LOGGER.debug("Shutting down Aquanta executor")
+            executor.shutdown()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+
+    return executor
@@ -0,0 +1,208 @@
+"""Stream per-device telemetry to rolling Parquet files.
+
+Each reading fetched from the API adds one row for its device: the tank
+readings, mode and settings as stored in the coordinator snapshot, stamped
+with the time the reading was fetched. Rows are collected on
+the event loop and written in batches from an executor, one row group per
+batch. A file is written as NAME.parquet.partial and renamed once it is
+closed, when it grows past MAX_FILE_SIZE or gets older than MAX_FILE_AGE,
+so every .parquet file in the export directory is complete and can be
+read while Home Assistant keeps exporting.
+
+pyarrow is not a requirement of the integration; exporting is only
+started when it is installed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import importlib.util
+import os
+import threading
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import LOGGER
+from .payload import mode_active
+
+# Rows kept in memory before a batch is written, and the longest they wait
+BATCH_ROWS = 1000
+BATCH_AGE = timedelta(minutes=5)
+
+# When a file is closed and the next one started
+MAX_FILE_SIZE = 64 * 1024 * 1024
+MAX_FILE_AGE = timedelta(days=1)
+
+PARTIAL_SUFFIX = ".partial"
+
+# Exported settings and the advanced response fields they come from
+SETTINGS = {
+    "control_enabled": "controlEnabled",
+    "intel_enabled": "intelEnabled",
+    "thermostat_enabled": "thermostatEnabled",
+    "tou_enabled": "touEnabled",
+    "timer_enabled": "timerEnabled",
+    "set_point": "setPoint",
+}
+
+COLUMNS = (
+    "time",
+    "device",
+    "temperature",
+    "available",
+    "mode",
+    "away",
+    "boost",
+    *SETTINGS,
+)
+
+
+def export_available() -> bool:
+    """Return true if pyarrow, which writes the files, is installed."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _schema():
+    # pylint: disable-next=import-outside-toplevel
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("time", pa.timestamp("us", tz="UTC")),
+            ("device", pa.int64()),
+            ("temperature", pa.float64()),
+            ("available", pa.float64()),
+            ("mode", pa.string()),
+            ("away", pa.bool_()),
+            ("boost", pa.bool_()),
+            *((name, pa.bool_()) for name in SETTINGS if name != "set_point"),
+            ("set_point", pa.float64()),
+        ]
+    )
+
+
+class TelemetryExporter:
+    """Append device snapshots to rolling Parquet files in DIRECTORY.
+
+    append() runs on the event loop and hands back a batch once one is due;
+    write() and close() must be run in an executor. pyarrow is only imported
+    there, so loading the integration never pays for it.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialize the exporter."""
+        self.directory = directory
+        self._batch: dict[str, list] = {column: [] for column in COLUMNS}
+        self._batch_started = 0.0
+        self._lock = threading.Lock()
+        self._writer: Any = None
+        self._path: str | None = None
+        self._opened = 0.0
+        self._closed = False
+        self.stats = {"rows": 0, "batches": 0, "files": 0, "errors": 0}
+
+    def append(
+        self, readings: Iterable[tuple[datetime, Any, dict[str, Any]]]
+    ) -> dict[str, list] | None:
+        """Add (time, id, device) READINGS, returning the batch once due."""
+        if not self._batch["time"]:
+            self._batch_started = time.monotonic()
+
+        columns = self._batch
+        for when, aquanta_id, device in readings:
+            water, info, advanced = device["water"], device["info"], device["advanced"]
+            columns["time"].append(when)
+            columns["device"].append(aquanta_id)
+            columns["temperature"].append(water["temperature"])
+            columns["available"].append(water["available"])
+            columns["mode"].append(info["currentMode"]["type"])
+            columns["away"].append(mode_active(info, "away"))
+            columns["boost"].append(mode_active(info, "boost"))
+            for name, field in SETTINGS.items():
+                columns[name].append(advanced[field])
+
+        if (
+            len(columns["time"]) >= BATCH_ROWS
+            or time.monotonic() - self._batch_started >= BATCH_AGE.total_seconds()
+        ):
+            return self.take()
+        return None
+
+    def take(self) -> dict[str, list] | None:
+        """Return the rows not written yet, if any."""
+        if not self._batch["time"]:
+            return None
+        batch, self._batch = self._batch, {column: [] for column in COLUMNS}
+        return batch
+
+    def write(self, batch: dict[str, list]) -> None:
+        """Write a batch as one row group, rotating the file when due.
+
+        A batch handed over before close() but written after it goes to a
+        file of its own, finished straight away.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        import pyarrow as pa
+
+        with self._lock:
+            try:
+                table = pa.Table.from_pydict(batch, schema=_schema())
+                self._open(table.schema).write_table(table)
+            except (OSError, pa.ArrowException, TypeError) as err:
+                self.stats["errors"] += 1
+                LOGGER.warning("Dropped %d exported rows: %s", len(batch["time"]), err)
+                return
+
+            self.stats["rows"] += table.num_rows
+            self.stats["batches"] += 1
+            if (
+                self._closed
+                or os.path.getsize(self._path + PARTIAL_SUFFIX) >= MAX_FILE_SIZE
+                or time.monotonic() - self._opened >= MAX_FILE_AGE.total_seconds()
+            ):
+                self._close()
+
+    def close(self, batch: dict[str, list] | None = None) -> None:
+        """Write the last BATCH, if any, and finish the current file."""
+        if batch is not None:
+            self.write(batch)
+        with self._lock:
+            self._closed = True
+            self._close()
+
+    def _open(self, schema):
+        if self._writer is not None:
+            return self._writer
+
+        # pylint: disable-next=import-outside-toplevel
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = f"{dt_util.utcnow():%Y%m%dT%H%M%S}"
+        self._path = os.path.join(self.directory, f"{stamp}.parquet")
+        # Files finished within the same second must not replace each other
+        index = 1
+        while os.path.exists(self._path) or os.path.exists(
+            self._path + PARTIAL_SUFFIX
+        ):
+            self._path = os.path.join(self.directory, f"{stamp}-{index}.parquet")
+            index += 1
+        self._writer = pq.ParquetWriter(
+            self._path + PARTIAL_SUFFIX, schema, compression="zstd"
+        )
+        self._opened = time.monotonic()
+        self.stats["files"] += 1
+        return self._writer
+
+    def _close(self) -> None:
+        if self._writer is None:
+            return
+        try:
+            self._writer.close()
+            os.replace(self._path + PARTIAL_SUFFIX, self._path)
+        except OSError as err:
+            LOGGER.warning("Could not finish export file %s: %s", self._path, err)
+        self._writer = None
@@ -0,0 +1,139 @@
+"""Hedge slow Aquanta reads with a duplicate request.
+
+The portal answers most reads quickly but now and then takes seconds, and
+one slow read can hold up a whole refresh. A hedged read that is still
+outstanding at the deadline is sent a second time and whichever answer
+arrives first is used; the other is dropped when it completes. Only reads
+are hedged, so a duplicate never changes anything upstream.
+
+The deadline follows a high percentile of recent read latencies, so only
+the slowest few reads qualify, and every hedge spends from a budget that
+grows by a small fraction of a token per read. The extra load is therefore
+bounded by that fraction however slow the portal gets.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import threading
+import time
+from typing import Any, TypeVar
+
+_R = TypeVar("_R")
+
+# Reads slower than this share of recent ones are hedged
+PERCENTILE = 0.95
+
+# Deadline used until enough latencies have been seen, and its bounds
+DEFAULT_DEADLINE = 2.0
+MIN_DEADLINE = 0.25
+MAX_DEADLINE = 5.0
+
+# Latencies kept for the percentile, and how many are needed to use it
+WINDOW = 200
+MIN_SAMPLES = 20
+
+# Hedges allowed per read, and how many unused ones can be saved up
+BUDGET_RATIO = 0.05
+BUDGET_BURST = 5.0
+
+# Threads carrying hedged reads; the caller waits on them
+MAX_WORKERS = 8
+
+
+class RequestHedger:
+    """Send reads with a hedge after an adaptive deadline, within a budget."""
+
+    def __init__(
+        self,
+        percentile: float = PERCENTILE,
+        budget_ratio: float = BUDGET_RATIO,
+        budget_burst: float = BUDGET_BURST,
+        default_deadline: float = DEFAULT_DEADLINE,
+    ) -> None:
+        """Initialize the hedger."""
+        self._pool = ThreadPoolExecutor(
+            MAX_WORKERS, thread_name_prefix="aquanta_hedge"
+        )
+        self._lock = threading.Lock()
+        self._percentile = percentile
+        self._budget_ratio = budget_ratio
+        self._budget_burst = budget_burst
+        self._default_deadline = default_deadline
+        self._latencies: deque[float] = deque(maxlen=WINDOW)
+        self._tokens = budget_burst
+        self.stats: dict[str, Any] = {
+            "requests": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "budget_exhausted": 0,
+            "deadline": default_deadline,
+        }
+
+    @property
+    def deadline(self) -> float:
+        """Return how long a read may take before it is hedged."""
+        with self._lock:
+            return self._deadline()
+
+    def _deadline(self) -> float:
+        if len(self._latencies) < MIN_SAMPLES:
+            return self._default_deadline
+        latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * self._percentile), len(latencies) - 1)
+        return min(max(latencies[index], MIN_DEADLINE), MAX_DEADLINE)
+
+    def request(self, send: Callable[[], _R]) -> _R:
+        """Call SEND, and again if it has not returned by the deadline.
+
+        Returns the first result; an error is only raised once both calls
+        have failed, or the first one failed without a hedge being sent.
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            self._tokens = min(self._tokens + self._budget_ratio, self._budget_burst)
+            deadline = self.stats["deadline"] = self._deadline()
+
+        primary = self._submit(send)
+        if wait([primary], timeout=deadline).done:
+            return primary.result()
+
+        with self._lock:
+            if exhausted := self._tokens < 1:
+                self.stats["budget_exhausted"] += 1
+            else:
+                self._tokens -= 1
+                self.stats["hedged"] += 1
+        if exhausted:
+            return primary.result()
+
+        hedge = self._submit(send)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # A success beats a failure finishing at the same time
+            for future in sorted(done, key=lambda item: item.exception() is not None):
+                if (failed := future.exception() is not None) and pending:
+                    continue
+                if future is hedge and not failed:
+                    with self._lock:
+                        self.stats["hedge_wins"] += 1
+                return future.result()
+
+    def _submit(self, send: Callable[[], _R]) -> Future[_R]:
+        start = time.monotonic()
+        future = self._pool.submit(send)
+
+        def observe(future: Future[_R]) -> None:
+            if future.exception() is None:
+                with self._lock:
+                    self._latencies.append(time.monotonic() - start)
+
+        future.add_done_callback(observe)
+        return future
+
+    def shutdown(self) -> None:
+        """Stop the threads once the reads in flight complete."""
+        self._pool.shutdown(wait=False)
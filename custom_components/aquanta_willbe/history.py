@@ -0,0 +1,134 @@
+"""Fixed-size history of recent readings for a single Aquanta device."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import timedelta
+
+# Readings kept per device, a few hours at the default poll interval
+HISTORY_SIZE = 256
+
+# Span of the heating/cooling rate regression
+RATE_WINDOW = timedelta(minutes=20)
+
+# Span of the hot water drawn total
+DRAWN_WINDOW = timedelta(hours=1)
+
+
+class _Window:
+    """Running sums over the readings of a sliding time window."""
+
+    __slots__ = ("span", "start", "n", "t", "y", "tt", "ty", "drawn")
+
+    def __init__(self, span: timedelta) -> None:
+        self.span = span.total_seconds()
+        self.start = 0  # sequence number of the oldest reading in the window
+        self.n = 0
+        self.t = self.y = self.tt = self.ty = self.drawn = 0.0
+
+    def add(self, t: float, y: float, drawn: float, sign: int = 1) -> None:
+        self.n += sign
+        self.t += sign * t
+        self.y += sign * y
+        self.tt += sign * t * t
+        self.ty += sign * t * y
+        self.drawn += sign * drawn
+
+
+class ReadingHistory:
+    """Ring buffer of tank readings with derived values kept up to date.
+
+    Readings live in preallocated arrays. Each sliding window keeps running
+    sums that are adjusted as readings enter and leave it, so appending a
+    reading and reading the derived values never walks the history.
+    """
+
+    def __init__(self, size: int = HISTORY_SIZE) -> None:
+        """Initialize an empty history."""
+        self._size = size
+        self._times = array("d", bytes(8 * size))
+        self._temperatures = array("d", bytes(8 * size))
+        self._drawn = array("d", bytes(8 * size))
+        self._total = 0  # sequence number of the next reading
+        self._origin: float | None = None
+        self._last_available: float | None = None
+        self._rate_window = _Window(RATE_WINDOW)
+        self._drawn_window = _Window(DRAWN_WINDOW)
+        self.temperature: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of readings held."""
+        return min(self._total, self._size)
+
+    def append(
+        self, now: float, temperature: float | None, available: float | None
+    ) -> None:
+        """Add a reading taken at monotonic time NOW."""
+        if temperature is None:
+            return
+
+        if self._origin is None:
+            self._origin = now
+        t = now - self._origin
+
+        drawn = 0.0
+        if available is not None:
+            if self._last_available is not None:
+                drawn = max(self._last_available - available, 0.0)
+            self._last_available = available
+
+        # Make room: the reading about to be overwritten leaves every window
+        for window in (self._rate_window, self._drawn_window):
+            self._evict(window, t, self._total + 1 - self._size)
+
+        index = self._total % self._size
+        self._times[index] = t
+        self._temperatures[index] = temperature
+        self._drawn[index] = drawn
+        self._total += 1
+        self.temperature = temperature
+
+        for window in (self._rate_window, self._drawn_window):
+            window.add(t, temperature, drawn)
+
+    def _evict(self, window: _Window, t: float, oldest: int) -> None:
+        """Drop readings that are too old for the window or about to be lost."""
+        while window.start < self._total:
+            index = window.start % self._size
+            if window.start >= oldest and self._times[index] >= t - window.span:
+                break
+            window.add(
+                self._times[index], self._temperatures[index], self._drawn[index], -1
+            )
+            window.start += 1
+
+    @property
+    def rate(self) -> float | None:
+        """Return the temperature trend in °C per hour, negative when cooling."""
+        window = self._rate_window
+        if window.n < 2:
+            return None
+
+        variance = window.n * window.tt - window.t * window.t
+        if variance <= 0:
+            return None
+
+        slope = (window.n * window.ty - window.t * window.y) / variance
+        return slope * 3600
+
+    def minutes_to(self, set_point: float | None) -> float | None:
+        """Return the estimated minutes until the tank reaches SET_POINT."""
+        if set_point is None or self.temperature is None:
+            return None
+        if self.temperature >= set_point:
+            return 0.0
+
+        rate = self.rate
+        if rate is None or rate <= 0:
+            return None
+        return (set_point - self.temperature) / rate * 60
+
+    @property
+    def drawn(self) -> float:
+        """Return the hot water drawn in the last hour as a fraction of the tank."""
+        return max(self._drawn_window.drawn, 0.0)
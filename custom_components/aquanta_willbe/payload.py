@@ -0,0 +1,66 @@
+"""Reduce Aquanta API responses to the fields the platforms read."""
+
+from __future__ import annotations
+
+from typing import Any
+
+ADVANCED_FIELDS = (
+    "controlEnabled",
+    "intelEnabled",
+    "thermostatEnabled",
+    "touEnabled",
+    "timerEnabled",
+    "setPoint",
+)
+
+
+def project_water(water: dict[str, Any]) -> dict[str, Any]:
+    """Return the tank readings from a water response."""
+    return {
+        "temperature": water.get("temperature"),
+        "available": water.get("available"),
+    }
+
+
+def project_info(info: dict[str, Any]) -> dict[str, Any]:
+    """Return the title, mode and ongoing records from an infocenter response.
+
+    The records list holds the device's whole schedule history, but only the
+    ongoing away and boost entries are ever looked at.
+    """
+    return {
+        "title": info.get("title"),
+        "currentMode": {"type": (info.get("currentMode") or {}).get("type")},
+        "records": [
+            {"type": record.get("type"), "state": "ongoing"}
+            for record in info.get("records") or ()
+            if record.get("state") == "ongoing"
+        ],
+    }
+
+
+def project_advanced(advanced: dict[str, Any]) -> dict[str, Any]:
+    """Return the settings the platforms read from an advanced response."""
+    return {field: advanced.get(field) for field in ADVANCED_FIELDS}
+
+
+def project_device(
+    water: dict[str, Any], info: dict[str, Any], advanced: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the stored payload for a single device."""
+    return {
+        "water": project_water(water),
+        "info": project_info(info),
+        "advanced": project_advanced(advanced),
+    }
+
+
+def mode_active(info: dict[str, Any], mode: str) -> bool:
+    """Return true if MODE (away or boost) is current or has an ongoing record."""
+    if info["currentMode"]["type"] == mode:
+        return True
+
+    return any(
+        record["type"] == mode and record["state"] == "ongoing"
+        for record in info["records"]
+    )
@@ -0,0 +1,189 @@
+"""Fleet boost and away planning for time-of-use and demand-response windows."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from aquanta import Aquanta
+import numpy as np
+import requests
+
+# Format of the start and end times sent to the Aquanta API (UTC)
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+
+# Windows sent per executor job, so a large plan does not hold a slot
+SUBMIT_CHUNK = 20
+
+
+@dataclass(frozen=True, kw_only=True)
+class PlanOptions:
+    """Tunables of the fleet planner."""
+
+    # Length of one tariff slot
+    slot: timedelta = timedelta(hours=1)
+    # Site load cap and the draw of one heater while boosting, in kW
+    load_cap: float = 10.0
+    heater_power: float = 4.5
+    # Tanks below TARGET_AVAILABLE are boosted back up to it
+    target_available: float = 0.9
+    # Time to heat a tank from empty to full
+    recovery: timedelta = timedelta(hours=2)
+    # Slots priced at or above this quantile form the peak window
+    peak_quantile: float = 0.8
+    # Only tanks with at least this much hot water are sent away for the peak
+    min_available: float = 0.5
+
+
+@dataclass(frozen=True)
+class Window:
+    """A boost or away window for one device."""
+
+    aquanta_id: Any
+    mode: str
+    start: datetime
+    end: datetime
+
+
+def _peak_window(prices: np.ndarray, quantile: float) -> tuple[int, int] | None:
+    """Return the first contiguous run of peak priced slots as [start, end)."""
+    threshold = np.quantile(prices, quantile)
+    peak = prices > threshold
+    if not peak.any():
+        peak = prices >= threshold
+    if peak.all():
+        return None
+
+    start = int(np.argmax(peak))
+    after = np.flatnonzero(~peak[start:])
+    end = start + int(after[0]) if after.size else len(prices)
+    return start, end
+
+
+def plan_fleet(
+    aquanta_ids: Sequence,
+    temperature: Sequence[float | None],
+    available: Sequence[float | None],
+    tou_enabled: Sequence[bool],
+    prices: Sequence[float],
+    start: datetime,
+    options: PlanOptions = PlanOptions(),
+) -> list[Window]:
+    """Compute staggered boost windows and peak away windows for a fleet.
+
+    Devices that run their own time-of-use schedule, or have not reported a
+    reading, are left alone. The rest are ranked by how little hot water
+    they hold and boosted back to the target in the cheapest stretch outside
+    the peak. Boosts are laid end to end on as many parallel lanes as the
+    load cap allows heaters running at once, so the site never draws more
+    than the cap; a cap below one heater's draw allows no boosts. Devices
+    with enough hot water to coast through the peak are sent away for it.
+
+    Every step is an array operation over the whole fleet.
+    """
+    prices = np.asarray(prices, dtype=float)
+    ids = np.asarray(aquanta_ids, dtype=object)
+    temp = np.array(
+        [np.nan if value is None else value for value in temperature], dtype=float
+    )
+    avail = np.array(
+        [np.nan if value is None else value for value in available], dtype=float
+    )
+    managed = (
+        ~np.asarray(tou_enabled, dtype=bool) & ~np.isnan(temp) & ~np.isnan(avail)
+    )
+
+    slots = len(prices)
+    if not slots or not managed.any():
+        return []
+
+    peak = _peak_window(prices, options.peak_quantile)
+    windows: list[Window] = []
+
+    def slot_time(index) -> datetime:
+        return start + options.slot * int(index)
+
+    # Away for the peak
+    if peak is not None:
+        away = ids[managed & (avail >= options.min_available)]
+        windows.extend(
+            Window(aquanta_id, "away", slot_time(peak[0]), slot_time(peak[1]))
+            for aquanta_id in away
+        )
+
+    # Boost slots needed to reach the target, most depleted tanks first
+    recovery_slots = options.recovery / options.slot
+    deficit = np.clip(options.target_available - avail, 0.0, None)
+    needed = np.where(managed, np.ceil(deficit * recovery_slots), 0).astype(int)
+    boost = np.flatnonzero(needed > 0)
+    lanes = int(options.load_cap // options.heater_power)
+    if not boost.size or not lanes:
+        return windows
+    boost = boost[np.lexsort((temp[boost], avail[boost]))]
+
+    # Round-robin onto lanes, each lane running its boosts back to back
+    lane = np.arange(boost.size) % lanes
+    order = np.argsort(lane, kind="stable")
+    durations = needed[boost][order]
+    ends = np.cumsum(durations)
+    lane_start = np.searchsorted(lane[order], lane[order], side="left")
+    offset = ends - durations - np.concatenate(([0], ends))[lane_start]
+
+    # Place the block of lanes on the cheapest stretch outside the peak
+    span = int(np.max(offset + durations))
+    in_peak = np.zeros(slots)
+    if peak is not None:
+        in_peak[peak[0] : peak[1]] = 1
+        span = min(span, max(peak[0], slots - peak[1]))
+    else:
+        span = min(span, slots)
+    if span <= 0:
+        return windows
+    price_totals = np.concatenate(([0.0], np.cumsum(prices)))
+    peak_totals = np.concatenate(([0.0], np.cumsum(in_peak)))
+    stretch = np.where(
+        peak_totals[span:] - peak_totals[:-span] > 0,
+        np.inf,
+        price_totals[span:] - price_totals[:-span],
+    )
+    first = int(np.argmin(stretch))
+
+    # Boosts that do not fit in the stretch wait for the next plan
+    begin = first + offset
+    end = begin + durations
+    fits = offset + durations <= span
+    windows.extend(
+        Window(aquanta_id, "boost", slot_time(window_start), slot_time(window_end))
+        for aquanta_id, window_start, window_end in zip(
+            ids[boost][order][fits], begin[fits], end[fits]
+        )
+    )
+    return windows
+
+
+def submit_plan(client: Aquanta, windows: Iterable[Window]) -> list[Window]:
+    """Send boost and away windows to their devices.
+
+    Must be run in an executor. All requests go out back to back on the
+    client's session; windows that fail are returned. Callers split large
+    plans into chunks of SUBMIT_CHUNK windows.
+    """
+    failed: list[Window] = []
+    try:
+        devices = client.devices()
+    except (RuntimeError, requests.RequestException):
+        return list(windows)
+    for window in windows:
+        if (device := devices.get(window.aquanta_id)) is None:
+            failed.append(window)
+            continue
+        command = device.set_boost if window.mode == "boost" else device.set_away
+        try:
+            command(
+                window.start.strftime(TIME_FORMAT), window.end.strftime(TIME_FORMAT)
+            )
+        except (RuntimeError, requests.RequestException):
+            failed.append(window)
+    return failed
@@ -0,0 +1,132 @@
+"""Serve an account's Aquanta data to other Home Assistant instances.
+
+One instance polls the Aquanta cloud and, with the "Share with other
+instances" option, answers device reads from its latest snapshot and
+forwards commands upstream. Other instances point their entry at it with
+the proxy options and run their coordinators over ProxyTransport, so the
+upstream load does not grow with the number of instances.
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import hashlib
+
+from aiohttp import web
+import requests
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import Unauthorized
+from homeassistant.helpers.json import json_bytes
+
+from .api import device_path, invalidate
+from .const import DOMAIN
+from .coordinator import AquantaCoordinator
+from .executor import RequestPriority
+
+# Device resources and where their projected payload is kept in the snapshot
+RESOURCES = {"water": "water", "infocenter": "info", "advanced": "advanced"}
+
+
+def proxy_account_key(account_id: str) -> str:
+    """Return the key identifying an account in proxy URLs.
+
+    Both sides know the account's username, which is kept out of URLs.
+    """
+    return hashlib.sha256(account_id.lower().encode()).hexdigest()[:16]
+
+
+class AquantaProxyView(HomeAssistantView):
+    """Device resources of shared accounts."""
+
+    url = f"/api/{DOMAIN}/proxy/{{account}}/v2/devices{{path:.*}}"
+    name = f"api:{DOMAIN}:proxy"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    def _coordinator(self, request: web.Request, account: str) -> AquantaCoordinator:
+        if not request["hass_user"].is_admin:
+            raise Unauthorized()
+
+        for coordinator in self.hass.data.get(DOMAIN, {}).values():
+            if coordinator.proxy_serve and (
+                proxy_account_key(coordinator.account_id) == account
+            ):
+                return coordinator
+        raise web.HTTPNotFound()
+
+    async def get(self, request: web.Request, account: str, path: str) -> web.Response:
+        """Return the device list or a device resource from the snapshot."""
+        coordinator = self._coordinator(request, account)
+        if not coordinator.last_update_success:
+            return self.json_message(
+                "Aquanta data unavailable", HTTPStatus.SERVICE_UNAVAILABLE
+            )
+
+        devices = coordinator.data["devices"]
+        if not path:
+            payload = [{"id": aquanta_id} for aquanta_id in devices]
+        else:
+            try:
+                _, aquanta_id, resource = path.split("/")
+                payload = devices[int(aquanta_id)][RESOURCES[resource]]
+            except (KeyError, ValueError):
+                raise web.HTTPNotFound() from None
+
+        body = json_bytes(payload)
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        return web.Response(
+            body=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+    async def put(self, request: web.Request, account: str, path: str) -> web.Response:
+        """Forward a device command upstream."""
+        return await self._forward(request, account, path, await request.json())
+
+    async def delete(
+        self, request: web.Request, account: str, path: str
+    ) -> web.Response:
+        """Forward a device command upstream."""
+        return await self._forward(request, account, path, None)
+
+    async def _forward(
+        self, request: web.Request, account: str, path: str, value
+    ) -> web.Response:
+        coordinator = self._coordinator(request, account)
+        try:
+            _, aquanta_id, command = path.split("/")
+            aquanta_id = int(aquanta_id)
+        except ValueError:
+            raise web.HTTPNotFound() from None
+
+        helper = coordinator.aquanta._helper
+        command_path = device_path(aquanta_id, command)
+        try:
+            if value is None:
+                await coordinator.executor.async_run(
+                    helper.delete, command_path, priority=RequestPriority.INTERACTIVE
+                )
+            else:
+                await coordinator.executor.async_run(
+                    helper.put,
+                    command_path,
+                    value,
+                    priority=RequestPriority.INTERACTIVE,
+                )
+        except (RuntimeError, requests.RequestException) as err:
+            return self.json_message(str(err), HTTPStatus.BAD_GATEWAY)
+
+        invalidate(coordinator.aquanta, aquanta_id, "infocenter", "advanced")
+        await coordinator.async_request_verify()
+        return self.json_message("OK")
+
+
+@callback
+def async_register_proxy_view(hass: HomeAssistant) -> None:
+    """Register the proxy endpoint."""
+    hass.http.register_view(AquantaProxyView(hass))
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorDeviceClass,
@@ -9,76 +12,114 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature, PERCENTAGE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfTemperature, UnitOfTime, PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .aggregate import FleetAggregate
 from .entity import AquantaEntity
-from .const import DOMAIN, LOGGER
+from .const import ATTRIBUTION, DOMAIN
 from .coordinator import AquantaCoordinator
+from .history import ReadingHistory
+
+# Stand-in for devices whose first readings are still being recorded
+NO_HISTORY = ReadingHistory(size=1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AquantaSensorEntityDescription(SensorEntityDescription):
+    """Describes an Aquanta device sensor."""
+
+    value_fn: Callable[[AquantaSensor], StateType]
+    # Published between polls from the coordinator's thermal estimates
+    estimated: bool = False
+
+
+@dataclass(frozen=True, kw_only=True)
+class AquantaAccountSensorEntityDescription(SensorEntityDescription):
+    """Describes an Aquanta account sensor."""
+
+    value_fn: Callable[[FleetAggregate], StateType]
+
+
+def _set_point(entity: AquantaSensor) -> float | None:
+    advanced = entity.coordinator.data["devices"][entity.aquanta_id]["advanced"]
+    return advanced["setPoint"] if advanced["thermostatEnabled"] else None
+
+
+def _hot_water_available(entity: AquantaSensor) -> float | None:
+    available = entity.coordinator.estimated_available(entity.aquanta_id)
+    return None if available is None else available * 100
+
 
 ENTITY_DESCRIPTIONS = (
-    {
-        "desc": SensorEntityDescription(
-            key="current_temperature",
-            name="Temperature",
-            device_class=SensorDeviceClass.TEMPERATURE,
-            state_class=SensorStateClass.MEASUREMENT,
-            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-            icon="mdi:water-thermometer",
-        ),
-        "native_value": lambda entity: entity.coordinator.data["devices"][
-            entity.aquanta_id
-        ]["water"]["temperature"],
-        "suggested_precision": None,
-        "options": None,
-    },
-    {
-        "desc": SensorEntityDescription(
-            key="set_point",
-            name="Set point",
-            device_class=SensorDeviceClass.TEMPERATURE,
-            state_class=SensorStateClass.MEASUREMENT,
-            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-            icon="mdi:thermometer-water",
-        ),
-        "native_value": lambda entity: entity.coordinator.data["devices"][
+    AquantaSensorEntityDescription(
+        key="current_temperature",
+        name="Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:water-thermometer",
+        value_fn=lambda entity: entity.coordinator.estimated_temperature(
             entity.aquanta_id
-        ]["advanced"]["setPoint"]
-        if entity.coordinator.data["devices"][entity.aquanta_id]["advanced"][
-            "thermostatEnabled"
-        ]
-        else None,
-        "suggested_precision": None,
-        "options": None,
-    },
-    {
-        "desc": SensorEntityDescription(
-            key="hot_water_available",
-            name="Hot water available",
-            state_class=SensorStateClass.MEASUREMENT,
-            native_unit_of_measurement=PERCENTAGE,
-            icon="mdi:water-percent",
-        ),
-        "native_value": lambda entity: (
-            entity.coordinator.data["devices"][entity.aquanta_id]["water"]["available"]
-            * 100
-        ),
-        "suggested_precision": 1,
-        "options": None,
-    },
-    {
-        "desc": SensorEntityDescription(
-            key="current_mode",
-            name="Mode",
-            device_class=SensorDeviceClass.ENUM,
-            icon="mdi:water-sync",
         ),
-        "native_value": lambda entity: entity.coordinator.data["devices"][
-            entity.aquanta_id
-        ]["info"]["currentMode"]["type"],
-        "suggested_precision": None,
-        "options": [
+        estimated=True,
+    ),
+    AquantaSensorEntityDescription(
+        key="set_point",
+        name="Set point",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:thermometer-water",
+        value_fn=_set_point,
+    ),
+    AquantaSensorEntityDescription(
+        key="hot_water_available",
+        name="Hot water available",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:water-percent",
+        suggested_display_precision=1,
+        value_fn=_hot_water_available,
+        estimated=True,
+    ),
+    AquantaSensorEntityDescription(
+        key="heating_rate",
+        name="Heating rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+        icon="mdi:thermometer-chevron-up",
+        suggested_display_precision=1,
+        value_fn=lambda entity: entity.history.rate,
+    ),
+    AquantaSensorEntityDescription(
+        key="time_to_set_point",
+        name="Time to set point",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        icon="mdi:timer-sand",
+        suggested_display_precision=0,
+        value_fn=lambda entity: entity.history.minutes_to(_set_point(entity)),
+    ),
+    AquantaSensorEntityDescription(
+        key="hot_water_drawn",
+        name="Hot water drawn last hour",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:water-minus",
+        suggested_display_precision=1,
+        value_fn=lambda entity: entity.history.drawn * 100,
+    ),
+    AquantaSensorEntityDescription(
+        key="current_mode",
+        name="Mode",
+        device_class=SensorDeviceClass.ENUM,
+        icon="mdi:water-sync",
+        options=[
             "away",
             "boost",
             "intelligence",
@@ -86,7 +127,60 @@ ENTITY_DESCRIPTIONS = (
             "setpoint",
             "timer",
         ],
-    },
+        value_fn=lambda entity: entity.coordinator.data["devices"][
+            entity.aquanta_id
+        ]["info"]["currentMode"]["type"],
+    ),
+)
+
+ACCOUNT_ENTITY_DESCRIPTIONS = (
+    AquantaAccountSensorEntityDescription(
+        key="devices",
+        name="Devices",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:water-boiler",
+        value_fn=lambda fleet: fleet.devices,
+    ),
+    AquantaAccountSensorEntityDescription(
+        key="average_temperature",
+        name="Average temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:water-thermometer",
+        suggested_display_precision=1,
+        value_fn=lambda fleet: fleet.average_temperature,
+    ),
+    AquantaAccountSensorEntityDescription(
+        key="total_hot_water_available",
+        name="Total hot water available",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="tanks",
+        icon="mdi:water-percent",
+        suggested_display_precision=1,
+        value_fn=lambda fleet: fleet.total_available,
+    ),
+    AquantaAccountSensorEntityDescription(
+        key="devices_away",
+        name="Devices in away mode",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:home-export-outline",
+        value_fn=lambda fleet: fleet.away,
+    ),
+    AquantaAccountSensorEntityDescription(
+        key="devices_boost",
+        name="Devices in boost mode",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:rocket-launch",
+        value_fn=lambda fleet: fleet.boost,
+    ),
+    AquantaAccountSensorEntityDescription(
+        key="devices_control_disabled",
+        name="Devices with control disabled",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:cancel",
+        value_fn=lambda fleet: fleet.control_disabled,
+    ),
 )
 
 
@@ -99,68 +193,81 @@ async def async_setup_entry(
 
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities: list[AquantaSensor] = []
-
-    for aquanta_id in coordinator.data["devices"]:
-        for entity_info in ENTITY_DESCRIPTIONS:
-            entities.append(
-                AquantaSensor(
-                    coordinator,
-                    aquanta_id,
-                    entity_info["desc"],
-                    entity_info["native_value"],
-                    entity_info["suggested_precision"],
-                    entity_info["options"],
-                )
-            )
+    @callback
+    def async_add_devices(aquanta_ids) -> None:
+        async_add_entities(
+            AquantaSensor(coordinator, aquanta_id, description)
+            for aquanta_id in aquanta_ids
+            for description in ENTITY_DESCRIPTIONS
+        )
 
-    async_add_entities(entities)
+    config_entry.async_on_unload(
+        coordinator.async_add_device_listener(async_add_devices)
+    )
+
+    async_add_entities(
+        AquantaAccountSensor(coordinator, description)
+        for description in ACCOUNT_ENTITY_DESCRIPTIONS
+    )
 
 
 class AquantaSensor(AquantaEntity, SensorEntity):
     """Represents a sensor for an Aquanta water heater controller."""
 
+    entity_description: AquantaSensorEntityDescription
+
+    @property
+    def history(self) -> ReadingHistory:
+        """Return the recent readings of this sensor's device."""
+        return self.coordinator.history.get(self.aquanta_id, NO_HISTORY)
+
+    async def async_added_to_hass(self) -> None:
+        """Publish interpolated values between polls for estimated sensors."""
+        await super().async_added_to_hass()
+        if self.entity_description.estimated:
+            self.async_on_remove(
+                self.coordinator.async_add_estimate_listener(self.async_write_ha_state)
+            )
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self)
+
+
+class AquantaAccountSensor(CoordinatorEntity, SensorEntity):
+    """Represents a fleet-wide sensor for an Aquanta account."""
+
+    _attr_attribution = ATTRIBUTION
     _attr_has_entity_name = True
-    _attr_should_poll = True
+    entity_description: AquantaAccountSensorEntityDescription
 
     def __init__(
         self,
         coordinator: AquantaCoordinator,
-        aquanta_id,
-        entity_description: SensorEntityDescription,
-        native_value_func,
-        suggested_precision: int | None,
-        options: list | None,
+        entity_description: AquantaAccountSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, aquanta_id)
-        self.entity_description: entity_description
-        self._attr_name = entity_description.name
-        self._native_value_func = native_value_func
-        self._attr_unique_id = self._base_unique_id + "_" + entity_description.key
-        LOGGER.debug("Created sensor with unique ID %s", self._attr_unique_id)
-
-        if entity_description.device_class is not None:
-            self._attr_device_class = entity_description.device_class
-
-        if entity_description.state_class is not None:
-            self._attr_state_class = entity_description.state_class
-
-        if entity_description.native_unit_of_measurement is not None:
-            self._attr_native_unit_of_measurement = (
-                entity_description.native_unit_of_measurement
-            )
-
-        if entity_description.icon is not None:
-            self._attr_icon = entity_description.icon
-
-        if suggested_precision is not None:
-            self._attr_suggested_display_precision = suggested_precision
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._fleet_version: tuple[int, bool] | None = None
+        self._attr_unique_id = (
+            f"{coordinator.account_id}_fleet_{entity_description.key}"
+        )
+        self._attr_device_info = coordinator.account_device_info
 
-        if options is not None:
-            self._attr_options = options
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write state when the fleet totals or availability changed."""
+        version = (
+            self.coordinator.fleet.version,
+            self.coordinator.last_update_success,
+        )
+        if version != self._fleet_version:
+            self._fleet_version = version
+            super()._handle_coordinator_update()
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self._native_value_func(self)
+        return self.entity_description.value_fn(self.coordinator.fleet)
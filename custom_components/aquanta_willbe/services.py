@@ -0,0 +1,149 @@
+"""Services for Aquanta."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .api import invalidate
+from .const import DOMAIN, LOGGER
+from .coordinator import AquantaCoordinator
+from .executor import RequestPriority
+from .planner import SUBMIT_CHUNK, PlanOptions, plan_fleet, submit_plan
+
+SERVICE_PLAN_FLEET = "plan_fleet"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_PRICES = "prices"
+ATTR_START = "start"
+ATTR_SLOT_MINUTES = "slot_minutes"
+ATTR_LOAD_CAP = "load_cap"
+ATTR_HEATER_POWER = "heater_power"
+ATTR_TARGET_AVAILABLE = "target_available"
+ATTR_RECOVERY_MINUTES = "recovery_minutes"
+ATTR_PEAK_QUANTILE = "peak_quantile"
+ATTR_MIN_AVAILABLE = "min_available"
+ATTR_DRY_RUN = "dry_run"
+
+PLAN_FLEET_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PRICES): vol.All(
+            cv.ensure_list, vol.Length(min=1), [vol.Coerce(float)]
+        ),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_SLOT_MINUTES, default=60): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_LOAD_CAP, default=10.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_HEATER_POWER, default=4.5): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1)
+        ),
+        vol.Optional(ATTR_TARGET_AVAILABLE, default=90): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(ATTR_RECOVERY_MINUTES, default=120): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_PEAK_QUANTILE, default=0.8): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+        vol.Optional(ATTR_MIN_AVAILABLE, default=50): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Aquanta services."""
+
+    async def async_plan_fleet(call: ServiceCall) -> ServiceResponse:
+        """Plan boost and away windows for every device and send them."""
+        coordinators: dict[str, AquantaCoordinator] = hass.data.get(DOMAIN, {})
+        if entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID):
+            if entry_id not in coordinators:
+                raise HomeAssistantError(f"Aquanta entry {entry_id} is not loaded")
+            coordinators = {entry_id: coordinators[entry_id]}
+
+        start = dt_util.as_utc(call.data.get(ATTR_START) or dt_util.utcnow())
+        options = PlanOptions(
+            slot=timedelta(minutes=call.data[ATTR_SLOT_MINUTES]),
+            load_cap=call.data[ATTR_LOAD_CAP],
+            heater_power=call.data[ATTR_HEATER_POWER],
+            target_available=call.data[ATTR_TARGET_AVAILABLE] / 100,
+            recovery=timedelta(minutes=call.data[ATTR_RECOVERY_MINUTES]),
+            peak_quantile=call.data[ATTR_PEAK_QUANTILE],
+            min_available=call.data[ATTR_MIN_AVAILABLE] / 100,
+        )
+
+        response: dict[str, list] = {"windows": [], "set": [], "failed": []}
+        for coordinator in coordinators.values():
+            devices = coordinator.data["devices"]
+            windows = plan_fleet(
+                list(devices),
+                [device["water"]["temperature"] for device in devices.values()],
+                [device["water"]["available"] for device in devices.values()],
+                [device["advanced"]["touEnabled"] for device in devices.values()],
+                call.data[ATTR_PRICES],
+                start,
+                options,
+            )
+            sent, failed = [], []
+            if windows and not call.data[ATTR_DRY_RUN]:
+                for index in range(0, len(windows), SUBMIT_CHUNK):
+                    chunk = windows[index : index + SUBMIT_CHUNK]
+                    chunk_failed = await coordinator.executor.async_run(
+                        submit_plan,
+                        coordinator.aquanta,
+                        chunk,
+                        priority=RequestPriority.INTERACTIVE,
+                    )
+                    failed.extend(chunk_failed)
+                    sent.extend(
+                        window for window in chunk if window not in chunk_failed
+                    )
+                for aquanta_id in {window.aquanta_id for window in windows}:
+                    invalidate(coordinator.aquanta, aquanta_id, "infocenter")
+                await coordinator.async_request_verify()
+
+            if failed:
+                LOGGER.warning(
+                    "%d of %d Aquanta plan windows could not be set",
+                    len(failed),
+                    len(windows),
+                )
+            for key, items in (("windows", windows), ("set", sent), ("failed", failed)):
+                response[key].extend(
+                    {
+                        "device": str(window.aquanta_id),
+                        "mode": window.mode,
+                        "start": window.start.isoformat(),
+                        "end": window.end.isoformat(),
+                    }
+                    for window in items
+                )
+
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PLAN_FLEET,
+        async_plan_fleet,
+        schema=PLAN_FLEET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
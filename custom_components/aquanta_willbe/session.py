@@ -0,0 +1,69 @@
+"""Hand off authenticated Aquanta sessions from the config flow to setup."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+import time
+
+from aquanta import Aquanta
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import create_client
+from .const import DATA_LOGINS, LOGGER
+
+# How long a session logged in by the config flow may be reused by setup
+LOGIN_HANDOFF_TTL = timedelta(minutes=5)
+
+
+@dataclass
+class PendingLogin:
+    """An authenticated client waiting to be picked up by entry setup."""
+
+    client: Aquanta
+    password: str
+    created: float
+
+    @property
+    def expired(self) -> bool:
+        """Return true if the session is too old to be handed off."""
+        return time.monotonic() - self.created > LOGIN_HANDOFF_TTL.total_seconds()
+
+
+def login(username: str, password: str) -> Aquanta:
+    """Log into Aquanta and enumerate the account's devices.
+
+    Must be run in an executor. Raises RuntimeError on invalid credentials.
+    """
+    client = create_client(username, password)
+    # The client caches the device list, so setup does not enumerate it again
+    client.devices()
+    return client
+
+
+@callback
+def async_store_login(
+    hass: HomeAssistant, username: str, password: str, client: Aquanta
+) -> None:
+    """Keep an authenticated client around for the next entry setup."""
+    logins: dict[str, PendingLogin] = hass.data.setdefault(DATA_LOGINS, {})
+
+    for key in [key for key, pending in logins.items() if pending.expired]:
+        logins.pop(key)
+
+    logins[username] = PendingLogin(client, password, time.monotonic())
+
+
+@callback
+def async_pop_login(
+    hass: HomeAssistant, username: str, password: str
+) -> Aquanta | None:
+    """Return the handed off client for the credentials, if still fresh."""
+    pending: PendingLogin | None = hass.data.get(DATA_LOGINS, {}).pop(username, None)
+
+    if pending is None or pending.expired or pending.password != password:
+        return None
+
+    LOGGER.debug("Reusing Aquanta session from config flow for %s", username)
+    return pending.client
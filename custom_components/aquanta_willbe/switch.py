@@ -2,40 +2,48 @@
 
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
 from homeassistant.components.switch import (
     SwitchEntity,
     SwitchDeviceClass,
     SwitchEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .entity import AquantaEntity
-from .const import DOMAIN, LOGGER
-from .coordinator import AquantaCoordinator
+from .const import DOMAIN
+
+
+@dataclass(frozen=True, kw_only=True)
+class AquantaSwitchEntityDescription(SwitchEntityDescription):
+    """Describes an Aquanta switch."""
+
+    is_on_fn: Callable[[AquantaEntity], bool]
+    turn_on_fn: Callable[[AquantaEntity], Awaitable[None]]
+    turn_off_fn: Callable[[AquantaEntity], Awaitable[None]]
+
 
 ENTITY_DESCRIPTIONS = (
-    {
-        "desc": SwitchEntityDescription(
-            key="away",
-            name="Away",
-            device_class=SwitchDeviceClass.SWITCH,
-        ),
-        "is_on": lambda entity: entity.is_away_mode_on,
-        "async_turn_on": lambda entity: entity.async_turn_away_mode_on,
-        "async_turn_off": lambda entity: entity.async_turn_away_mode_off,
-    },
-    {
-        "desc": SwitchEntityDescription(
-            key="boost",
-            name="Boost",
-            device_class=SwitchDeviceClass.SWITCH,
-        ),
-        "is_on": lambda entity: entity.is_boost_mode_on,
-        "async_turn_on": lambda entity: entity.async_turn_boost_mode_on,
-        "async_turn_off": lambda entity: entity.async_turn_boost_mode_off,
-    },
+    AquantaSwitchEntityDescription(
+        key="away",
+        name="Away",
+        device_class=SwitchDeviceClass.SWITCH,
+        is_on_fn=lambda entity: entity.is_away_mode_on,
+        turn_on_fn=lambda entity: entity.async_turn_away_mode_on(),
+        turn_off_fn=lambda entity: entity.async_turn_away_mode_off(),
+    ),
+    AquantaSwitchEntityDescription(
+        key="boost",
+        name="Boost",
+        device_class=SwitchDeviceClass.SWITCH,
+        is_on_fn=lambda entity: entity.is_boost_mode_on,
+        turn_on_fn=lambda entity: entity.async_turn_boost_mode_on(),
+        turn_off_fn=lambda entity: entity.async_turn_boost_mode_off(),
+    ),
 )
 
 
@@ -47,58 +55,34 @@ async def async_setup_entry(
     """Initialize Aquanta devices from config entry."""
 
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    entities: list[AquantaSwitch] = []
 
-    for aquanta_id in coordinator.data["devices"]:
-        for entity_info in ENTITY_DESCRIPTIONS:
-            entities.append(
-                AquantaSwitch(
-                    coordinator,
-                    aquanta_id,
-                    entity_info["desc"],
-                    entity_info["is_on"],
-                    entity_info["async_turn_on"],
-                    entity_info["async_turn_off"],
-                )
-            )
+    @callback
+    def async_add_devices(aquanta_ids) -> None:
+        async_add_entities(
+            AquantaSwitch(coordinator, aquanta_id, description)
+            for aquanta_id in aquanta_ids
+            for description in ENTITY_DESCRIPTIONS
+        )
 
-    async_add_entities(entities)
+    config_entry.async_on_unload(
+        coordinator.async_add_device_listener(async_add_devices)
+    )
 
 
 class AquantaSwitch(AquantaEntity, SwitchEntity):
     """Represents a toggle switch for an Aquanta device."""
 
-    _attr_has_entity_name = True
-    _attr_should_poll = True
-
-    def __init__(
-        self,
-        coordinator: AquantaCoordinator,
-        aquanta_id,
-        entity_description: SwitchEntityDescription,
-        is_on_func,
-        async_turn_on_func,
-        async_turn_off_func,
-    ) -> None:
-        """Initialize the switch."""
-        super().__init__(coordinator, aquanta_id)
-        self.entity_description = entity_description
-        self._attr_name = entity_description.name
-        self._is_on_func = is_on_func
-        self._async_turn_on_func = async_turn_on_func
-        self._async_turn_off_func = async_turn_off_func
-        self._attr_unique_id = self._base_unique_id + "_" + entity_description.key
-        LOGGER.debug("Created switch with unique ID %s", self._attr_unique_id)
+    entity_description: AquantaSwitchEntityDescription
 
     @property
     def is_on(self):
         """Return true if the switch is on."""
-        return self._is_on_func(self)
+        return self.entity_description.is_on_fn(self)
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
-        return await self._async_turn_on_func(self)()
+        await self.entity_description.turn_on_fn(self)
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
-        return await self._async_turn_off_func(self)()
+        await self.entity_description.turn_off_fn(self)
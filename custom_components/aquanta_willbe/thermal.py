@@ -0,0 +1,130 @@
+"""Online thermal model of an Aquanta-controlled tank."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+# Weight of the newest observation in the running averages
+SMOOTHING = 0.3
+
+# Predictions are held flat past this horizon
+MAX_HORIZON = timedelta(minutes=10)
+
+# Temperature changes smaller than this between polls count as no change
+NOISE_FLOOR = 0.2
+
+
+def _ewma(average: float | None, value: float) -> float:
+    if average is None:
+        return value
+    return average + SMOOTHING * (value - average)
+
+
+class ThermalEstimator:
+    """Predict tank temperature and hot water availability between polls.
+
+    Heating and standby decay rates are learned separately from successive
+    readings, and the model tracks how quickly its own prediction error
+    grows so the coordinator can decide when the next poll is worth it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an untrained estimator."""
+        self.heating_rate: float | None = None  # °C/s while heating
+        self.decay_rate: float | None = None  # °C/s in standby, <= 0
+        self.available_heating_rate: float | None = None  # fraction/s
+        self.available_decay_rate: float | None = None  # fraction/s
+        self.error_rate: float | None = None  # °C of error per second
+        self.heating = False
+        self.set_point: float | None = None
+        self._temperature: float | None = None
+        self._available: float | None = None
+        self._time: float | None = None
+
+    @property
+    def trained(self) -> bool:
+        """Return true once the model has seen enough readings to predict."""
+        rate = self.heating_rate if self.heating else self.decay_rate
+        return rate is not None
+
+    def update(
+        self,
+        temperature: float | None,
+        available: float | None,
+        now: float,
+        set_point: float | None = None,
+    ) -> None:
+        """Learn from a fresh reading taken at monotonic time NOW."""
+        if temperature is None:
+            return
+
+        self.set_point = set_point
+
+        if self._temperature is not None and now > self._time:
+            elapsed = now - self._time
+
+            if self.trained:
+                error = abs(self.predict_temperature(now) - temperature)
+                self.error_rate = _ewma(self.error_rate, error / elapsed)
+
+            change = temperature - self._temperature
+            rate = change / elapsed
+            if change > NOISE_FLOOR:
+                self.heating = True
+                self.heating_rate = _ewma(self.heating_rate, rate)
+            else:
+                self.heating = False
+                self.decay_rate = _ewma(self.decay_rate, min(rate, 0.0))
+
+            if available is not None and self._available is not None:
+                available_rate = (available - self._available) / elapsed
+                if self.heating:
+                    self.available_heating_rate = _ewma(
+                        self.available_heating_rate, available_rate
+                    )
+                else:
+                    self.available_decay_rate = _ewma(
+                        self.available_decay_rate, min(available_rate, 0.0)
+                    )
+
+        self._temperature = temperature
+        self._available = available
+        self._time = now
+
+    def _elapsed(self, now: float) -> float:
+        return min(max(now - self._time, 0.0), MAX_HORIZON.total_seconds())
+
+    def predict_temperature(self, now: float) -> float | None:
+        """Return the estimated tank temperature at monotonic time NOW."""
+        if self._temperature is None:
+            return None
+
+        rate = self.heating_rate if self.heating else self.decay_rate
+        if rate is None:
+            return self._temperature
+
+        estimate = self._temperature + rate * self._elapsed(now)
+        if self.heating and self.set_point is not None:
+            estimate = min(estimate, max(self.set_point, self._temperature))
+        return estimate
+
+    def predict_available(self, now: float) -> float | None:
+        """Return the estimated hot water availability (0-1) at time NOW."""
+        if self._available is None:
+            return None
+
+        rate = (
+            self.available_heating_rate if self.heating else self.available_decay_rate
+        )
+        if rate is None:
+            return self._available
+
+        return min(max(self._available + rate * self._elapsed(now), 0.0), 1.0)
+
+    def seconds_until_error(self, tolerance: float) -> float | None:
+        """Return how long predictions are expected to stay within TOLERANCE °C."""
+        if not self.trained or self.error_rate is None:
+            return None
+        if self.error_rate <= 0:
+            return MAX_HORIZON.total_seconds()
+        return tolerance / self.error_rate
@@ -0,0 +1,277 @@
+"""Record Aquanta API traffic and replay it against the integration.
+
+A trace is a JSON lines file with one exchange per line: when it started
+(seconds since recording began), method, path, status, latency, response
+size and the sanitized response body. Bodies that are not JSON, such as
+error pages during an outage, are kept as base64 in body_base64 instead.
+Credentials, personal details and device IDs never reach the file, so
+traces can be shared and replayed offline with ReplayAquanta, see
+scripts/replay.
+"""
+
+from __future__ import annotations
+
+import base64
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+import re
+import threading
+import time
+from typing import Any, NamedTuple, TextIO
+
+from aquanta.aquanta import AquantaDevice
+
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util.json import json_loads
+
+from .api import AquantaApiHelper
+
+REDACTED = "**REDACTED**"
+
+# Response fields that identify the account holder or their home
+SENSITIVE_KEYS = frozenset(
+    {
+        "address",
+        "apiKey",
+        "city",
+        "email",
+        "firstName",
+        "idToken",
+        "lastName",
+        "latitude",
+        "longitude",
+        "macAddress",
+        "name",
+        "phone",
+        "refreshToken",
+        "serialNumber",
+        "title",
+        "token",
+        "userId",
+        "zip",
+    }
+)
+
+_DEVICE_PATH = re.compile(r"^/v2/devices/(\d+)")
+
+
+class TraceRecorder:
+    """Append sanitized API exchanges to a trace file.
+
+    Called from executor threads; the file is opened on the first exchange
+    so enabling recording never blocks the event loop.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the recorder."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: TextIO | None = None
+        self._start = time.monotonic()
+        self._aliases: dict[Any, int] = {}
+
+    def record(
+        self, method: str, path: str, status: int, elapsed: float, content: bytes
+    ) -> None:
+        """Record one exchange that started ELAPSED seconds ago."""
+        raw = None
+        try:
+            body = json_loads(content) if content else None
+        except ValueError:
+            body = None
+            raw = base64.b64encode(content).decode()
+        with self._lock:
+            exchange = {
+                "t": round(time.monotonic() - elapsed - self._start, 3),
+                "method": method,
+                "path": _DEVICE_PATH.sub(
+                    lambda match: f"/v2/devices/{self._alias(int(match[1]))}",
+                    path.split("?", 1)[0],
+                ),
+                "status": status,
+                "elapsed": round(elapsed, 4),
+                "size": len(content),
+                "body": self._sanitize(body),
+            }
+            if raw is not None:
+                exchange["body_base64"] = raw
+            line = json_dumps(exchange)
+            if self._file is None:
+                # pylint: disable-next=consider-using-with
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the trace file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _alias(self, aquanta_id) -> int:
+        return self._aliases.setdefault(aquanta_id, len(self._aliases) + 1)
+
+    def _sanitize(self, value):
+        if isinstance(value, dict):
+            return {
+                key: REDACTED
+                if key in SENSITIVE_KEYS
+                else self._alias(item)
+                if key == "id" and isinstance(item, int)
+                else self._sanitize(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._sanitize(item) for item in value]
+        return value
+
+
+def load_trace(path: str) -> list[dict[str, Any]]:
+    """Read a trace file. Must be run in an executor."""
+    with open(path, encoding="utf-8") as file:
+        return [json_loads(line) for line in file if line.strip()]
+
+
+class _ReplayResponse(NamedTuple):
+    """The parts of a requests response the HTTP layer reads."""
+
+    status_code: int
+    content: bytes
+    headers: dict[str, str]
+
+    @property
+    def ok(self) -> bool:
+        """Return true for a successful status."""
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        """Return the body as text."""
+        return self.content.decode()
+
+
+class ReplayTransport:
+    """Serve GET requests from a trace instead of the Aquanta cloud.
+
+    Each GET returns the most recent recorded response for its path at the
+    simulated time given by CLOCK, after sleeping for the recorded latency
+    times LATENCY_SCALE. Commands always succeed and are only counted.
+    """
+
+    name = "replay"
+
+    def __init__(
+        self,
+        exchanges: Iterable[dict[str, Any]],
+        clock: Callable[[], float],
+        latency_scale: float = 1.0,
+    ) -> None:
+        """Initialize the transport."""
+        self._clock = clock
+        self.latency_scale = latency_scale
+        self._responses: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for exchange in exchanges:
+            if exchange["method"] == "GET":
+                self._responses[exchange["path"]].append(exchange)
+        self._starts = {
+            path: [exchange["t"] for exchange in responses]
+            for path, responses in self._responses.items()
+        }
+        self.calls: dict[str, int] = defaultdict(int)
+
+    def request(
+        self, method: str, path: str, headers: Mapping[str, str], value: Any = None
+    ) -> _ReplayResponse:
+        """Return the recorded response to a request."""
+        self.calls[method] += 1
+        if method != "GET":
+            return _ReplayResponse(200, b"", {})
+
+        if not (responses := self._responses.get(path)):
+            return _ReplayResponse(404, b"", {})
+
+        index = max(bisect_right(self._starts[path], self._clock()) - 1, 0)
+        exchange = responses[index]
+        time.sleep(exchange["elapsed"] * self.latency_scale)
+        if (raw := exchange.get("body_base64")) is not None:
+            content = base64.b64decode(raw)
+        elif (body := exchange["body"]) is not None:
+            content = json_dumps(body).encode()
+        else:
+            content = b""
+        return _ReplayResponse(exchange["status"], content, {})
+
+
+class ReplayAquanta:
+    """Stand-in for an Aquanta client that replays a trace."""
+
+    def __init__(
+        self,
+        exchanges: Iterable[dict[str, Any]],
+        clock: Callable[[], float],
+        latency_scale: float = 1.0,
+    ) -> None:
+        """Initialize the client."""
+        self._helper = AquantaApiHelper(None, None)
+        self._helper.transport = ReplayTransport(exchanges, clock, latency_scale)
+        # Cached resources expire on the simulated clock
+        self._helper._clock = clock
+        self._devices = None
+
+    def devices(self):
+        """Return the devices listed in the trace."""
+        if not self._devices:
+            self._devices = {
+                device["id"]: AquantaDevice(self._helper, device["id"])
+                for device in self._helper.get("/v2/devices")
+            }
+        return self._devices
+
+
+class ReplayReport:
+    """Per simulated hour totals of a replay."""
+
+    def __init__(self) -> None:
+        """Initialize the report."""
+        self.hours: dict[int, dict[str, Any]] = {}
+
+    def _hour(self, sim_time: float) -> dict[str, Any]:
+        return self.hours.setdefault(
+            int(sim_time // 3600),
+            {"refreshes": [], "api_calls": 0, "state_writes": 0, "cpu": 0.0},
+        )
+
+    def add_refresh(self, sim_time: float, latency: float) -> None:
+        """Record a coordinator refresh that took LATENCY seconds."""
+        self._hour(sim_time)["refreshes"].append(latency)
+
+    def add(self, sim_time: float, key: str, amount: float = 1) -> None:
+        """Add to the api_calls, state_writes or cpu total of the hour."""
+        self._hour(sim_time)[key] += amount
+
+    def save(self, path: str) -> None:
+        """Write the summary as JSON lines. Must be run in an executor."""
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(json_dumps(row) + "\n" for row in self.summary())
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Return one row of totals per simulated hour."""
+        rows = []
+        for hour, totals in sorted(self.hours.items()):
+            latencies = sorted(totals["refreshes"])
+            rows.append(
+                {
+                    "hour": hour,
+                    "refreshes": len(latencies),
+                    "latency_p50": latencies[len(latencies) // 2]
+                    if latencies
+                    else None,
+                    "latency_max": latencies[-1] if latencies else None,
+                    "api_calls": totals["api_calls"],
+                    "state_writes": totals["state_writes"],
+                    "cpu": round(totals["cpu"], 4),
+                }
+            )
+        return rows
@@ -0,0 +1,198 @@
+"""Transports carrying Aquanta API requests.
+
+The HTTP layer in api.py caches, decodes and records responses; a transport
+only moves a request to wherever it is served. CloudTransport talks to the
+Aquanta cloud. LocalTransport sends device reads and writes straight to a
+controller on the LAN when DHCP discovery has seen its address, and falls
+back to the cloud whenever the controller does not answer. ProxyTransport
+reads from another Home Assistant instance that shares its snapshots.
+
+Aquanta does not document a local API, so LocalTransport is off unless
+enabled in the options. It assumes the controller serves its device
+resources under the same paths as the cloud, and only trusts a read that
+comes back as JSON; controllers that refuse, fail, time out or answer
+anything else are sent to the cloud for LOCAL_RETRY before being tried
+again. Commands only go to a controller once it has answered a read.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import timedelta
+import re
+import threading
+import time
+from typing import Any
+
+import requests
+
+from homeassistant.util.json import json_loads
+
+from .const import DOMAIN, LOGGER
+
+API_BASE = "https://api.aquanta.io"
+
+# Controllers answer from the LAN or not at all, so give up quickly
+LOCAL_TIMEOUT = (1.0, 2.0)
+
+# How long a controller that failed a local request is skipped
+LOCAL_RETRY = timedelta(minutes=10)
+
+# Proxied reads are answered from memory by the serving instance
+PROXY_TIMEOUT = 10
+
+_DEVICE_PATH = re.compile(r"^/v2/devices/(\d+)/")
+
+
+class CloudTransport:
+    """Send requests to the Aquanta cloud."""
+
+    name = "cloud"
+
+    def __init__(self, session: requests.Session, timeout) -> None:
+        """Initialize the transport."""
+        self._session = session
+        self._timeout = timeout
+
+    def request(
+        self, method: str, path: str, headers: Mapping[str, str], value: Any = None
+    ) -> requests.Response:
+        """Send a request for API PATH."""
+        url = API_BASE + path
+        if method == "GET":
+            return self._session.get(url, timeout=self._timeout, headers=headers)
+        if method == "PUT":
+            return self._session.put(
+                url, json=value, timeout=self._timeout, headers=headers
+            )
+        return self._session.delete(url, timeout=self._timeout, headers=headers)
+
+
+def _check_json(resp: requests.Response) -> None:
+    """Raise ValueError unless RESP carries a JSON document."""
+    content_type = resp.headers.get("Content-Type", "")
+    if content_type.split(";", 1)[0].strip() != "application/json":
+        raise ValueError(f"unexpected content type {content_type!r}")
+    json_loads(resp.content)
+
+
+class LocalTransport:
+    """Send device requests to controllers on the LAN, else to the cloud.
+
+    HOSTS maps device IDs, as strings, to the addresses DHCP discovery has
+    seen and is read on every request, so new leases apply immediately.
+    Cloud credentials are never sent to the LAN, and commands are only sent
+    to an address after a read from it returned valid JSON, so a host that
+    merely claims a controller's name does not receive them.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        cloud: CloudTransport,
+        hosts: Mapping[str, str],
+        session: requests.Session | None = None,
+    ) -> None:
+        """Initialize the transport."""
+        self.cloud = cloud
+        self._hosts = hosts
+        self._session = session or requests.Session()
+        self._lock = threading.Lock()
+        self._skip_until: dict[str, float] = {}
+        # Hosts whose last local read returned valid JSON
+        self._verified: set[str] = set()
+        self.stats = {"local": 0, "cloud": 0, "fallbacks": 0}
+
+    def _local_host(self, method: str, path: str) -> tuple[str, str] | None:
+        if (match := _DEVICE_PATH.match(path)) is None:
+            return None
+        if (host := self._hosts.get(match[1])) is None:
+            return None
+        with self._lock:
+            if self._skip_until.get(host, 0) > time.monotonic():
+                return None
+            if method != "GET" and host not in self._verified:
+                return None
+        return match[1], host
+
+    def request(
+        self, method: str, path: str, headers: Mapping[str, str], value: Any = None
+    ) -> requests.Response:
+        """Send a request for API PATH, locally if the controller is known."""
+        if (local := self._local_host(method, path)) is not None:
+            aquanta_id, host = local
+            try:
+                resp = self._session.request(
+                    method,
+                    f"http://{host}{path}",
+                    json=value,
+                    timeout=LOCAL_TIMEOUT,
+                )
+                if not resp.ok:
+                    raise requests.HTTPError(f"status {resp.status_code}")
+                if method == "GET":
+                    _check_json(resp)
+            except (requests.RequestException, ValueError) as err:
+                self._fall_back(aquanta_id, host, err)
+            else:
+                with self._lock:
+                    self.stats["local"] += 1
+                    if method == "GET":
+                        self._verified.add(host)
+                return resp
+
+        with self._lock:
+            self.stats["cloud"] += 1
+        return self.cloud.request(method, path, headers, value)
+
+    def _fall_back(self, aquanta_id: str, host: str, reason) -> None:
+        with self._lock:
+            self.stats["fallbacks"] += 1
+            self._verified.discard(host)
+            self._skip_until[host] = time.monotonic() + LOCAL_RETRY.total_seconds()
+        LOGGER.debug(
+            "Aquanta device %s at %s did not answer locally (%s), using the cloud",
+            aquanta_id,
+            host,
+            reason,
+        )
+
+
+class ProxyTransport:
+    """Send requests to another Home Assistant instance sharing its Aquanta data.
+
+    The serving instance answers reads from its latest coordinator snapshot
+    and forwards commands upstream, see proxy.py. Requests are authorized
+    with a token of that instance instead of the Aquanta API key.
+    """
+
+    name = "proxy"
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        account_key: str,
+        session: requests.Session | None = None,
+    ) -> None:
+        """Initialize the transport."""
+        self._base = f"{url.rstrip('/')}/api/{DOMAIN}/proxy/{account_key}"
+        self._token = token
+        self._session = session or requests.Session()
+
+    def request(
+        self, method: str, path: str, headers: Mapping[str, str], value: Any = None
+    ) -> requests.Response:
+        """Send a request for API PATH to the serving instance."""
+        headers = {
+            **{key: item for key, item in headers.items() if key != "Authorization"},
+            "Authorization": f"Bearer {self._token}",
+        }
+        return self._session.request(
+            method,
+            self._base + path,
+            json=value,
+            headers=headers,
+            timeout=PROXY_TIMEOUT,
+        )
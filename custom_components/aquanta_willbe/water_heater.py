@@ -33,13 +33,16 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_PASSWORD, 
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import json_loads
 
+from .api import invalidate
 from .entity import AquantaEntity
 from .const import DOMAIN, LOGGER
+from .executor import RequestPriority
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -49,14 +52,16 @@ async def async_setup_entry(
     """Initialize Aquanta devices from config entry."""
 
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    entities: list[AquantaWaterHeater] = []
 
-    for aquanta_id in coordinator.data["devices"]:
-        entities.append(
-            AquantaWaterHeater(coordinator, aquanta_id)
+    @callback
+    def async_add_devices(aquanta_ids) -> None:
+        async_add_entities(
+            AquantaWaterHeater(coordinator, aquanta_id) for aquanta_id in aquanta_ids
         )
 
-    async_add_entities(entities)
+    config_entry.async_on_unload(
+        coordinator.async_add_device_listener(async_add_devices)
+    )
 
 class AquantaWaterHeater(AquantaEntity, WaterHeaterEntity):
     """Representation of an Aquanta water heater controller."""
@@ -70,14 +75,20 @@ class AquantaWaterHeater(AquantaEntity, WaterHeaterEntity):
     def __init__(self, coordinator, aquanta_id) -> None:
         """Initialize the water heater."""
         super().__init__(coordinator, aquanta_id)
-        self._attr_name = "Water heater"
         self._attr_unique_id = self._base_unique_id + "_water_heater"
         LOGGER.debug("Created water heater with unique ID %s", self._attr_unique_id)
 
+    async def async_added_to_hass(self) -> None:
+        """Publish the estimated temperature between polls."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_estimate_listener(self.async_write_ha_state)
+        )
+
     @property
     def current_temperature(self):
         """Return the current temperature."""
-        return self.coordinator.data["devices"][self.aquanta_id]["water"]["temperature"]
+        return self.coordinator.estimated_temperature(self.aquanta_id)
 
     @property
     def current_operation(self):
@@ -167,8 +178,7 @@ class AquantaWaterHeater(AquantaEntity, WaterHeaterEntity):
                     LOGGER.error(f"Aquanta Login Failed (Google): {text}")
                     return None
                 
-                google_data = await resp_google.json()
-                id_token = google_data.get("idToken")
+                id_token = json_loads(await resp_google.read()).get("idToken")
 
             # Step 2: Aquanta Portal Login
             aquanta_url = "https://portal.aquanta.io/portal/login"
@@ -224,7 +234,10 @@ class AquantaWaterHeater(AquantaEntity, WaterHeaterEntity):
             
             # 1. Login if we don't have a cookie yet
             if CACHED_PORTAL_COOKIE is None:
-                await self._async_get_fresh_cookie()
+                async with self.coordinator.executor.async_slot(
+                    RequestPriority.INTERACTIVE
+                ):
+                    await self._async_get_fresh_cookie()
                 
             if CACHED_PORTAL_COOKIE is None:
                 LOGGER.error("Aquanta: Could not obtain cookie. Aborting.")
@@ -249,27 +262,36 @@ class AquantaWaterHeater(AquantaEntity, WaterHeaterEntity):
                     "Origin": "https://portal.aquanta.io"
                 }
                 
-                return await session.put(url, json=payload, headers=headers)
+                # Only the status matters unless the request failed
+                async with self.coordinator.executor.async_slot(
+                    RequestPriority.INTERACTIVE
+                ), session.put(url, json=payload, headers=headers) as resp:
+                    if resp.status in [200, 201, 204, 401]:
+                        return resp.status, None
+                    return resp.status, await resp.text()
 
             # 2. Try Request
-            resp = await _send_request(CACHED_PORTAL_COOKIE)
+            status, text = await _send_request(CACHED_PORTAL_COOKIE)
 
             # 3. Handle Expiry (401)
-            if resp.status == 401:
+            if status == 401:
                 LOGGER.warning("Aquanta: Cookie expired (401). Refreshing and retrying...")
-                await self._async_get_fresh_cookie()
+                async with self.coordinator.executor.async_slot(
+                    RequestPriority.INTERACTIVE
+                ):
+                    await self._async_get_fresh_cookie()
                 
                 if CACHED_PORTAL_COOKIE:
                     # Retry once
-                    resp = await _send_request(CACHED_PORTAL_COOKIE)
+                    status, text = await _send_request(CACHED_PORTAL_COOKIE)
 
             # 4. Final Result Check
-            if resp.status in [200, 201, 204]:
+            if status in [200, 201, 204]:
                 LOGGER.info(f"Aquanta: Successfully set temperature to {clean_temp}°C")
-                await self.coordinator.async_request_refresh()
+                invalidate(self._api, self.aquanta_id, "advanced")
+                await self.coordinator.async_request_verify()
             else:
-                text = await resp.text()
-                LOGGER.error(f"Aquanta Error: Failed to set temp (Status {resp.status}). Response: {text}")
+                LOGGER.error(f"Aquanta Error: Failed to set temp (Status {status}). Response: {text}")
 
         except Exception as e:
             LOGGER.error(f"Aquanta Critical Error: {e}")
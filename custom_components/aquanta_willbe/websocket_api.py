@@ -0,0 +1,120 @@
+"""Websocket API streaming compact Aquanta fleet snapshots."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import AquantaCoordinator
+from .payload import mode_active
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the Aquanta websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe_fleet)
+
+
+def compact_device(device: dict[str, Any]) -> dict[str, Any]:
+    """Return the compact state of a single device."""
+    water = device["water"]
+    info = device["info"]
+    advanced = device["advanced"]
+    return {
+        "name": info["title"],
+        "temperature": water["temperature"],
+        "available": water["available"],
+        "mode": info["currentMode"]["type"],
+        "away": mode_active(info, "away"),
+        "boost": mode_active(info, "boost"),
+        "set_point": advanced["setPoint"] if advanced["thermostatEnabled"] else None,
+        "control_enabled": advanced["controlEnabled"],
+    }
+
+
+def compact_fleet(coordinator: AquantaCoordinator) -> dict[str, dict[str, Any]]:
+    """Return the compact state of every device, keyed by device ID."""
+    return {
+        str(aquanta_id): compact_device(device)
+        for aquanta_id, device in coordinator.data["devices"].items()
+    }
+
+
+def fleet_status(coordinator: AquantaCoordinator) -> dict[str, Any]:
+    """Return whether the account's data is current, stale or unavailable."""
+    age = coordinator.data_age
+    return {
+        "stale": coordinator.stale,
+        "last_update_success": coordinator.last_update_success,
+        "data_age": None if age is None else round(age.total_seconds()),
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/fleet/subscribe",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe_fleet(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send a snapshot of the account's devices, then changes on refresh.
+
+    Every event carries the account's status, and an event is also sent when
+    only the status changed, so clients learn when the data goes stale or
+    unavailable.
+    """
+    coordinator: AquantaCoordinator | None = hass.data.get(DOMAIN, {}).get(
+        msg["entry_id"]
+    )
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Aquanta entry not found"
+        )
+        return
+
+    last = compact_fleet(coordinator)
+    last_status = fleet_status(coordinator)
+
+    @callback
+    def async_send_changes() -> None:
+        nonlocal last, last_status
+        current = compact_fleet(coordinator)
+        changed = {
+            aquanta_id: device
+            for aquanta_id, device in current.items()
+            if last.get(aquanta_id) != device
+        }
+        removed = [aquanta_id for aquanta_id in last if aquanta_id not in current]
+        status = fleet_status(coordinator)
+        # The data age moves on every refresh and only matters with the rest
+        status_changed = (status["stale"], status["last_update_success"]) != (
+            last_status["stale"],
+            last_status["last_update_success"],
+        )
+        last = current
+        last_status = status
+
+        if changed or removed or status_changed:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {"changed": changed, "removed": removed, **status}
+                )
+            )
+
+    connection.subscriptions[msg["id"]] = coordinator.async_add_listener(
+        async_send_changes
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], {"snapshot": last, **last_status})
+    )
@@ -0,0 +1,52 @@
+"""Test the account-wide fleet totals."""
+import pytest
+
+from custom_components.aquanta_willbe.aggregate import FleetAggregate
+
+
+def _device(temperature, available, mode="intelligence", control=True):
+    return {
+        "water": {"temperature": temperature, "available": available},
+        "info": {"currentMode": {"type": mode}, "records": []},
+        "advanced": {"controlEnabled": control},
+    }
+
+
+def test_totals_follow_device_changes():
+    """Test totals are adjusted as devices change, join and leave."""
+    fleet = FleetAggregate()
+    fleet.update(1, _device(50.0, 1.0))
+    fleet.update(2, _device(40.0, 0.5, mode="away", control=False))
+
+    assert fleet.devices == 2
+    assert fleet.average_temperature == pytest.approx(45.0)
+    assert fleet.total_available == pytest.approx(1.5)
+    assert (fleet.away, fleet.boost, fleet.control_disabled) == (1, 0, 1)
+
+    fleet.update(2, _device(44.0, 0.5, mode="boost"))
+    assert fleet.average_temperature == pytest.approx(47.0)
+    assert (fleet.away, fleet.boost, fleet.control_disabled) == (0, 1, 0)
+
+    fleet.remove(1)
+    assert fleet.devices == 1
+    assert fleet.average_temperature == pytest.approx(44.0)
+
+
+def test_unchanged_device_keeps_version():
+    """Test an identical payload does not count as a change."""
+    fleet = FleetAggregate()
+    fleet.update(1, _device(50.0, 1.0))
+    version = fleet.version
+
+    fleet.update(1, _device(50.0, 1.0))
+
+    assert fleet.version == version
+
+
+def test_missing_temperature_not_averaged():
+    """Test devices without a reading do not drag the average down."""
+    fleet = FleetAggregate()
+    fleet.update(1, _device(None, None))
+
+    assert fleet.average_temperature is None
+    assert fleet.total_available == 0.0
@@ -0,0 +1,107 @@
+"""Test the Aquanta HTTP layer."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.aquanta_willbe.api import AquantaApiHelper, device_path
+from custom_components.aquanta_willbe.payload import project_water
+
+
+def _helper(body: bytes = b'{"temperature": 50.0, "available": 0.5}'):
+    """Return a helper whose session answers every GET with BODY."""
+    session = MagicMock()
+    session.get.return_value = MagicMock(ok=True, content=body)
+    return AquantaApiHelper(session, 5), session
+
+
+def test_projected_reads_are_cached():
+    """Test a resource read twice within its TTL is fetched once."""
+    helper, session = _helper()
+    path = device_path(1, "water")
+
+    assert helper.get(path, project_water) == {"temperature": 50.0, "available": 0.5}
+    assert helper.get(path, project_water) == {"temperature": 50.0, "available": 0.5}
+    assert session.get.call_count == 1
+    assert helper.stats["hits"] == 1
+
+
+def test_invalidate_forces_refetch():
+    """Test a write to a device drops its cached resources."""
+    helper, session = _helper()
+    path = device_path(1, "water")
+
+    helper.get(path, project_water)
+    helper.invalidate(1, "water", "advanced")
+    helper.get(path, project_water)
+
+    assert session.get.call_count == 2
+    assert helper.stats["invalidated"] == 1
+
+
+def test_failed_reads_are_not_cached():
+    """Test an error is not served from cache to later reads."""
+    helper, session = _helper()
+    session.get.return_value = MagicMock(ok=False)
+    path = device_path(1, "water")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            helper.get(path, project_water)
+
+    assert session.get.call_count == 2
+
+
+def test_unprojected_reads_bypass_cache():
+    """Test plain reads, such as the device list, are never cached."""
+    helper, session = _helper(b"[]")
+
+    helper.get("/v2/devices")
+    helper.get("/v2/devices")
+
+    assert session.get.call_count == 2
+
+
+def test_not_modified_reuses_payload():
+    """Test a 304 answer to a conditional read returns the previous payload."""
+    helper, session = _helper()
+    session.get.return_value.headers = {"ETag": '"v1"'}
+    path = device_path(1, "water")
+
+    first = helper.get(path, project_water)
+    helper.invalidate(1, "water")
+    session.get.return_value = MagicMock(ok=True, status_code=304, content=b"")
+
+    assert helper.get(path, project_water) is first
+    assert session.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert helper.stats["not_modified"] == 1
+
+
+def test_fetch_count_skips_cache_hits():
+    """Test every read from the API counts as a new reading, cached ones not."""
+    helper, session = _helper()
+    session.get.return_value.headers = {"ETag": '"v1"'}
+    path = device_path(1, "water")
+
+    helper.get(path, project_water)
+    helper.get(path, project_water)
+    assert helper.fetch_count(path) == 1
+
+    helper.invalidate(1, "water")
+    session.get.return_value = MagicMock(ok=True, status_code=304, content=b"")
+    helper.get(path, project_water)
+    assert helper.fetch_count(path) == 2
+
+
+def test_unchanged_content_not_decoded_again():
+    """Test an identical body without validators skips decoding."""
+    helper, session = _helper()
+    session.get.return_value.headers = {}
+    path = device_path(1, "water")
+    project = MagicMock(side_effect=project_water)
+
+    first = helper.get(path, project)
+    helper.invalidate(1, "water")
+
+    assert helper.get(path, project) is first
+    assert project.call_count == 1
+    assert helper.stats["unchanged"] == 1
@@ -0,0 +1,255 @@
+"""Test the Aquanta data update coordinator."""
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.aquanta_willbe.const import (
+    CONF_HEDGE_REQUESTS,
+    CONF_MAX_STALENESS,
+)
+from custom_components.aquanta_willbe.payload import project_device
+from custom_components.aquanta_willbe.coordinator import (
+    RETRY_INTERVAL_MIN,
+    AquantaCoordinator,
+)
+from custom_components.aquanta_willbe.export import TelemetryExporter
+
+from .const import MOCK_CONFIG
+
+DEVICE_DATA = {
+    "id": "test_username",
+    "devices": {
+        1: project_device(
+            {"temperature": 50.0, "available": 0.8},
+            {"title": "Garage", "currentMode": {"type": "intel"}},
+            {"thermostatEnabled": False},
+        )
+    },
+}
+
+
+@pytest.fixture
+def coordinator(hass):
+    """Return a coordinator with a mocked Aquanta client."""
+    return AquantaCoordinator(
+        hass, MagicMock(), MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    )
+
+
+async def test_serves_stale_data_on_failure(hass, coordinator):
+    """Test the last good data is kept while the cloud is unreachable."""
+    with patch.object(coordinator, "async_get_device_data", return_value=DEVICE_DATA):
+        await coordinator.async_refresh()
+
+    with patch.object(coordinator, "async_get_device_data", side_effect=RuntimeError):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.stale
+    assert coordinator.data == DEVICE_DATA
+    assert coordinator.update_interval == RETRY_INTERVAL_MIN
+
+
+async def test_serves_stale_data_on_connection_error(hass, coordinator):
+    """Test network errors from the client are served stale like API errors."""
+    with patch.object(coordinator, "async_get_device_data", return_value=DEVICE_DATA):
+        await coordinator.async_refresh()
+
+    with patch.object(
+        coordinator,
+        "async_get_device_data",
+        side_effect=requests.ConnectionError("Connection refused"),
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.stale
+    assert coordinator.data == DEVICE_DATA
+
+
+async def test_unavailable_after_max_staleness(hass, coordinator):
+    """Test entities go unavailable once the data is older than allowed."""
+    coordinator.async_apply_options({CONF_MAX_STALENESS: 1})
+
+    with patch.object(coordinator, "async_get_device_data", return_value=DEVICE_DATA):
+        await coordinator.async_refresh()
+
+    coordinator.last_success_time = dt_util.utcnow() - timedelta(minutes=2)
+
+    with patch.object(coordinator, "async_get_device_data", side_effect=RuntimeError):
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert not coordinator.stale
+
+
+async def test_first_refresh_failure_not_served_stale(hass, coordinator):
+    """Test there is nothing to serve before the first successful refresh."""
+    with patch.object(
+        coordinator, "async_get_device_data", side_effect=RuntimeError
+    ), pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+
+async def test_device_list_refreshed_on_schedule(hass, coordinator):
+    """Test the device list is cached between rediscoveries."""
+    coordinator.aquanta.devices.return_value = {1: None}
+    coordinator.aquanta._devices = {1: None}
+
+    with patch(
+        "custom_components.aquanta_willbe.coordinator.fetch_device",
+        return_value=DEVICE_DATA["devices"][1],
+    ):
+        # The list enumerated by the login is kept by the first refresh
+        await coordinator.async_refresh()
+        assert coordinator.aquanta._devices == {1: None}
+
+        await coordinator.async_refresh()
+        assert coordinator.aquanta._devices == {1: None}
+
+        # A failed refresh rediscovers on the next one
+        coordinator._serve_stale(RuntimeError())
+        await coordinator.async_refresh()
+        assert coordinator.aquanta._devices is None
+
+    assert coordinator.data["devices"] == DEVICE_DATA["devices"]
+
+
+async def test_refreshes_accounts_larger_than_executor_queue(hass, coordinator):
+    """Test device fetches queue in the coordinator instead of being rejected."""
+    count = coordinator.executor._limit + 32
+    devices = {aquanta_id: None for aquanta_id in range(count)}
+    coordinator.aquanta.devices.return_value = devices
+
+    with patch(
+        "custom_components.aquanta_willbe.coordinator.fetch_device",
+        return_value=DEVICE_DATA["devices"][1],
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert set(coordinator.data["devices"]) == set(devices)
+    assert coordinator.executor.stats["rejected"] == 0
+
+
+async def test_unchanged_readings_feed_models(hass, coordinator):
+    """Test a fetched reading reaches the models even when it is unchanged."""
+    device = project_device(
+        {"temperature": 50.0, "available": 0.8},
+        {"currentMode": {"type": "intel"}, "records": []},
+        {"thermostatEnabled": False},
+    )
+    data = {"id": "test_username", "devices": {1: device}}
+
+    with patch(
+        "custom_components.aquanta_willbe.coordinator.reading_sequence",
+        side_effect=[1, 1, 2],
+    ):
+        for _ in range(3):
+            coordinator._record_readings(data)
+
+    # The second pass was served from the response cache
+    assert len(coordinator.history[1]) == 2
+
+
+async def test_exports_fetched_readings_once(hass, coordinator, tmp_path):
+    """Test only new readings are exported, stamped with their fetch time."""
+    device = project_device(
+        {"temperature": 50.0, "available": 0.8},
+        {"currentMode": {"type": "intel"}, "records": []},
+        {"thermostatEnabled": False},
+    )
+    data = {"id": "test_username", "devices": {1: device}}
+    fetched = dt_util.utcnow() - timedelta(seconds=5)
+    coordinator.exporter = TelemetryExporter(str(tmp_path))
+
+    with patch(
+        "custom_components.aquanta_willbe.coordinator.reading_sequence",
+        side_effect=[1, 1, 2],
+    ), patch(
+        "custom_components.aquanta_willbe.coordinator.reading_time",
+        return_value=fetched,
+    ):
+        for _ in range(3):
+            coordinator._export(data, coordinator._record_readings(data))
+
+    # The second pass was served from the response cache
+    batch = coordinator.exporter.take()
+    assert batch["device"] == [1, 1]
+    assert batch["time"] == [fetched, fetched]
+
+
+async def test_set_client_keeps_options(hass, coordinator):
+    """Test a new client is swapped in with the coordinator's options applied."""
+    coordinator.async_apply_options({CONF_HEDGE_REQUESTS: True})
+    client = MagicMock()
+
+    coordinator.async_set_client(client, "new_password")
+
+    assert coordinator.aquanta is client
+    assert coordinator.password == "new_password"
+    assert client._helper.hedger is coordinator.hedger is not None
+    coordinator.async_stop_hedging()
+
+
+async def test_device_listener_gets_new_devices(hass, coordinator):
+    """Test listeners get the known devices at once and new ones as they appear."""
+    added = []
+    with patch.object(coordinator, "async_get_device_data", return_value=DEVICE_DATA):
+        await coordinator.async_refresh()
+    remove = coordinator.async_add_device_listener(added.append)
+    assert added == [[1]]
+
+    device = DEVICE_DATA["devices"][1]
+    data = {**DEVICE_DATA, "devices": {1: device, 2: device}}
+    with patch.object(coordinator, "async_get_device_data", return_value=data):
+        await coordinator.async_refresh()
+    assert added == [[1], [2]]
+
+    remove()
+    data = {**data, "devices": {**data["devices"], 3: device}}
+    with patch.object(coordinator, "async_get_device_data", return_value=data):
+        await coordinator.async_refresh()
+    assert added == [[1], [2]]
+
+
+async def test_first_refresh_adds_devices_as_they_arrive(hass, coordinator):
+    """Test entities are added per device while the first refresh runs."""
+    added = []
+    coordinator.async_add_device_listener(added.append)
+    coordinator.aquanta.devices.return_value = {1: None, 2: None}
+
+    with patch(
+        "custom_components.aquanta_willbe.coordinator.FETCH_CONCURRENCY", 1
+    ), patch(
+        "custom_components.aquanta_willbe.coordinator.fetch_device",
+        return_value=DEVICE_DATA["devices"][1],
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert added == [[], [1], [2]]
+
+
+async def test_failed_first_refresh_keeps_arrived_devices(hass, coordinator):
+    """Test devices fetched before a failure stay available to the platforms."""
+    added = []
+    coordinator.async_add_device_listener(added.append)
+    coordinator.aquanta.devices.return_value = {1: None, 2: None}
+
+    with patch(
+        "custom_components.aquanta_willbe.coordinator.FETCH_CONCURRENCY", 1
+    ), patch(
+        "custom_components.aquanta_willbe.coordinator.fetch_device",
+        side_effect=[DEVICE_DATA["devices"][1], RuntimeError],
+    ):
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert added == [[], [1]]
+    assert coordinator.data["devices"] == DEVICE_DATA["devices"]
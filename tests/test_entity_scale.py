@@ -0,0 +1,137 @@
+"""Benchmark entity setup for accounts with many devices."""
+import time
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aquanta_willbe import binary_sensor, sensor, switch
+from custom_components.aquanta_willbe.const import DOMAIN
+from custom_components.aquanta_willbe.coordinator import AquantaCoordinator
+
+from .const import MOCK_CONFIG
+
+DEVICES = 1000
+
+
+def _device_data(devices: int) -> dict:
+    """Return coordinator data for DEVICES synthetic controllers."""
+    return {
+        "id": MOCK_CONFIG["username"],
+        "devices": {
+            aquanta_id: {
+                "water": {"temperature": 50.0, "available": 0.8},
+                "info": {
+                    "title": f"Water heater {aquanta_id}",
+                    "currentMode": {"type": "intelligence"},
+                    "records": [],
+                },
+                "advanced": {
+                    "controlEnabled": True,
+                    "intelEnabled": True,
+                    "thermostatEnabled": False,
+                    "touEnabled": False,
+                    "timerEnabled": False,
+                    "setPoint": None,
+                },
+            }
+            for aquanta_id in range(devices)
+        },
+    }
+
+
+def test_descriptions_shared_between_devices(hass):
+    """Test entities reference the shared description and device info."""
+    coordinator = AquantaCoordinator(
+        hass, MagicMock(), MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    )
+    coordinator.data = _device_data(2)
+    description = sensor.ENTITY_DESCRIPTIONS[0]
+
+    first = sensor.AquantaSensor(coordinator, 0, description)
+    second = sensor.AquantaSensor(coordinator, 1, description)
+    again = switch.AquantaSwitch(coordinator, 0, switch.ENTITY_DESCRIPTIONS[0])
+
+    assert first.entity_description is second.entity_description
+    assert first.device_info is again.device_info
+    assert first.unique_id == f"{MOCK_CONFIG['username']}_0_current_temperature"
+    assert "_attr_icon" not in vars(first)
+    # Updates come from the coordinator, never from entity polling
+    assert not first.should_poll
+    assert not again.should_poll
+
+
+def test_sensor_without_availability(hass):
+    """Test a device that reports no availability reads as unknown."""
+    coordinator = AquantaCoordinator(
+        hass, MagicMock(), MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    )
+    coordinator.data = _device_data(1)
+    coordinator.data["devices"][0]["water"]["available"] = None
+    (description,) = (
+        description
+        for description in sensor.ENTITY_DESCRIPTIONS
+        if description.key == "hot_water_available"
+    )
+
+    entity = sensor.AquantaSensor(coordinator, 0, description)
+    assert description.value_fn(entity) is None
+
+
+def test_history_sensor_updates_on_unchanged_payload(hass):
+    """Test a new reading is written even when its payload is the same object."""
+    coordinator = AquantaCoordinator(
+        hass, MagicMock(), MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    )
+    coordinator.data = _device_data(1)
+    (description,) = (
+        description
+        for description in sensor.ENTITY_DESCRIPTIONS
+        if description.key == "heating_rate"
+    )
+    entity = sensor.AquantaSensor(coordinator, 0, description)
+    written = []
+
+    with patch(
+        "custom_components.aquanta_willbe.coordinator.reading_sequence",
+        side_effect=[1, 2, 2],
+    ), patch.object(
+        entity,
+        "async_write_ha_state",
+        side_effect=lambda: written.append(entity.native_value),
+    ):
+        for _ in range(3):
+            coordinator._record_readings(coordinator.data)
+            entity._handle_coordinator_update()
+
+    # The third pass was a cache hit, so there is nothing new to write
+    assert written == [None, 0.0]
+
+
+async def test_setup_time_and_memory(hass):
+    """Benchmark setting up every platform for a large account."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, entry_id="scale")
+    entry.add_to_hass(hass)
+    data = _device_data(DEVICES)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    with patch(
+        "custom_components.aquanta_willbe.login", return_value=MagicMock()
+    ), patch.object(AquantaCoordinator, "async_get_device_data", return_value=data):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    elapsed = time.perf_counter() - started
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    per_device = (
+        len(binary_sensor.ENTITY_DESCRIPTIONS)
+        + len(sensor.ENTITY_DESCRIPTIONS)
+        + len(switch.ENTITY_DESCRIPTIONS)
+        + 1
+    )
+    assert len(hass.states.async_all()) >= DEVICES * per_device
+    assert elapsed < 60
+    assert retained / DEVICES < 256 * 1024
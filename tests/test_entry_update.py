@@ -0,0 +1,149 @@
+"""Test applying config entry updates to a running entry."""
+from unittest.mock import MagicMock, patch
+
+from homeassistant.config_entries import SOURCE_REAUTH
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aquanta_willbe.const import (
+    CONF_PROXY_TOKEN,
+    CONF_PROXY_URL,
+    DOMAIN,
+)
+from custom_components.aquanta_willbe.coordinator import AquantaCoordinator
+
+from .const import MOCK_CONFIG
+
+DATA = {
+    "id": MOCK_CONFIG["username"],
+    "devices": {
+        7: {
+            "water": {"temperature": 50.0, "available": 0.8},
+            "info": {
+                "title": "Garage",
+                "currentMode": {"type": "intelligence"},
+                "records": [],
+            },
+            "advanced": {
+                "controlEnabled": True,
+                "intelEnabled": True,
+                "thermostatEnabled": False,
+                "touEnabled": False,
+                "timerEnabled": False,
+                "setPoint": None,
+            },
+        }
+    },
+}
+
+
+@pytest.fixture
+async def entry(hass):
+    """Return a set up entry whose logins and refreshes are mocked."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, entry_id="update")
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.aquanta_willbe.login", return_value=MagicMock()
+    ), patch.object(AquantaCoordinator, "async_get_device_data", return_value=DATA):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        yield entry
+
+
+async def test_password_swapped_in_place(hass, entry):
+    """Test a new password logs in again without reloading the entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    client = MagicMock()
+
+    with patch(
+        "custom_components.aquanta_willbe.login", return_value=client
+    ) as login:
+        hass.config_entries.async_update_entry(
+            entry, data={**MOCK_CONFIG, CONF_PASSWORD: "new_password"}
+        )
+        await hass.async_block_till_done()
+
+    login.assert_called_once_with(MOCK_CONFIG[CONF_USERNAME], "new_password")
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    assert coordinator.aquanta is client
+    assert coordinator.password == "new_password"
+
+
+async def test_failed_login_starts_reauth(hass, entry):
+    """Test a password that is rejected keeps the old client and asks again."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.aquanta
+
+    with patch(
+        "custom_components.aquanta_willbe.login", side_effect=RuntimeError("denied")
+    ):
+        hass.config_entries.async_update_entry(
+            entry, data={**MOCK_CONFIG, CONF_PASSWORD: "wrong_password"}
+        )
+        await hass.async_block_till_done()
+
+    assert coordinator.aquanta is client
+    assert list(entry.async_get_active_flows(hass, {SOURCE_REAUTH}))
+
+
+async def test_username_change_reloads(hass, entry):
+    """Test a different account rebuilds the coordinator."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    hass.config_entries.async_update_entry(
+        entry, data={**MOCK_CONFIG, CONF_USERNAME: "other_username"}
+    )
+    await hass.async_block_till_done()
+
+    reloaded = hass.data[DOMAIN][entry.entry_id]
+    assert reloaded is not coordinator
+    assert reloaded.account_id == "other_username"
+
+
+async def test_proxy_change_reloads(hass, entry):
+    """Test reading through another instance rebuilds the client."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    hass.config_entries.async_update_entry(
+        entry,
+        options={CONF_PROXY_URL: "http://other:8123", CONF_PROXY_TOKEN: "token"},
+    )
+    await hass.async_block_till_done()
+
+    reloaded = hass.data[DOMAIN][entry.entry_id]
+    assert reloaded is not coordinator
+    assert reloaded.proxy_options == ("http://other:8123", "token")
+
+
+async def test_reauth_swaps_login_without_reload(hass, entry):
+    """Test reauthenticating reuses the flow's login and keeps the entry loaded."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    client = MagicMock()
+    credentials = {**MOCK_CONFIG, CONF_PASSWORD: "new_password"}
+
+    with patch(
+        "custom_components.aquanta_willbe.session.create_client",
+        return_value=client,
+    ) as create_client, patch.object(
+        hass.config_entries, "async_reload", wraps=hass.config_entries.async_reload
+    ) as reload:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": SOURCE_REAUTH, "entry_id": entry.entry_id},
+            data=entry.data,
+        )
+        assert result["type"] == FlowResultType.FORM
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], credentials
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    create_client.assert_called_once_with(MOCK_CONFIG[CONF_USERNAME], "new_password")
+    reload.assert_not_called()
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    assert coordinator.aquanta is client
+    assert coordinator.password == "new_password"
@@ -0,0 +1,119 @@
+"""Test the prioritized Aquanta executor."""
+import asyncio
+import threading
+
+import pytest
+
+from custom_components.aquanta_willbe.executor import (
+    AquantaBusyError,
+    AquantaExecutor,
+    RequestPriority,
+)
+
+
+async def test_interactive_calls_run_before_background_backlog():
+    """Test a user command does not wait behind queued polling."""
+    executor = AquantaExecutor(max_workers=2)
+    release = threading.Event()
+    order = []
+
+    def call(name):
+        release.wait(5)
+        order.append(name)
+
+    background = [
+        asyncio.create_task(executor.async_run(call, f"poll{index}"))
+        for index in range(4)
+    ]
+    await asyncio.sleep(0)
+    command = asyncio.create_task(
+        executor.async_run(call, "command", priority=RequestPriority.INTERACTIVE)
+    )
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(command, *background)
+
+    assert order.index("command") <= 1
+    executor.shutdown()
+
+
+async def test_queued_call_cancelled_never_runs():
+    """Test cancelling a waiting call keeps it from running."""
+    executor = AquantaExecutor(max_workers=2)
+    release = threading.Event()
+    ran = []
+
+    blocker = asyncio.create_task(executor.async_run(release.wait, 5))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(executor.async_run(ran.append, "queued"))
+    await asyncio.sleep(0)
+    queued.cancel()
+    release.set()
+    await blocker
+
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert not ran
+    assert executor.stats["cancelled"] == 1
+    executor.shutdown()
+
+
+async def test_rejects_calls_over_queue_limit():
+    """Test calls beyond the queue limit fail fast."""
+    executor = AquantaExecutor(max_workers=1, max_queued=0)
+    release = threading.Event()
+
+    blocker = asyncio.create_task(executor.async_run(release.wait, 5))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AquantaBusyError):
+        await executor.async_run(print)
+
+    release.set()
+    await blocker
+    executor.shutdown()
+
+
+async def test_interactive_calls_use_reserved_queue():
+    """Test a user command is accepted while polling fills the queue."""
+    executor = AquantaExecutor(max_workers=1, max_queued=0)
+    release = threading.Event()
+
+    blocker = asyncio.create_task(executor.async_run(release.wait, 5))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AquantaBusyError):
+        await executor.async_run(release.is_set)
+    command = asyncio.create_task(
+        executor.async_run(release.is_set, priority=RequestPriority.INTERACTIVE)
+    )
+    await asyncio.sleep(0)
+
+    release.set()
+    await blocker
+    assert await command
+    executor.shutdown()
+
+
+async def test_cancelled_running_call_keeps_its_slot():
+    """Test a running call holds its worker until its thread returns."""
+    executor = AquantaExecutor(max_workers=1)
+    release = threading.Event()
+    ran = []
+
+    running = asyncio.create_task(executor.async_run(release.wait, 5))
+    await asyncio.sleep(0.05)
+    running.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await running
+
+    queued = asyncio.create_task(executor.async_run(ran.append, "queued"))
+    await asyncio.sleep(0.05)
+    assert not ran
+    assert executor.stats["pending"] == 2
+
+    release.set()
+    await queued
+    assert ran == ["queued"]
+    assert executor.stats["pending"] == 0
+    executor.shutdown()
@@ -0,0 +1,101 @@
+"""Test the telemetry export."""
+from datetime import datetime, timezone
+import os
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.aquanta_willbe.export import (
+    TelemetryExporter,
+    export_available,
+)
+from custom_components.aquanta_willbe.payload import project_device
+
+DEVICES = {
+    7: project_device(
+        {"temperature": 51.5, "available": 0.8},
+        {"title": "Garage", "currentMode": {"type": "intel"}, "records": []},
+        {"controlEnabled": True, "touEnabled": False, "setPoint": 52},
+    )
+}
+
+WHEN = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+READINGS = [(WHEN, 7, DEVICES[7])]
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_batches_written_as_complete_files(tmp_path):
+    """Rows are held until a batch is due, then readable once closed."""
+    exporter = TelemetryExporter(str(tmp_path))
+
+    with patch("custom_components.aquanta_willbe.export.BATCH_ROWS", 2):
+        assert exporter.append(READINGS) is None
+        batch = exporter.append(READINGS)
+
+    exporter.write(batch)
+    assert all(name.endswith(".partial") for name in os.listdir(tmp_path))
+
+    exporter.append(READINGS)
+    exporter.close(exporter.take())
+
+    (name,) = os.listdir(tmp_path)
+    assert name.endswith(".parquet")
+    table = pq.read_table(tmp_path / name)
+    assert table.num_rows == 3
+    row = table.slice(0, 1).to_pylist()[0]
+    assert row["time"] == WHEN
+    assert row["device"] == 7
+    assert row["temperature"] == 51.5
+    assert row["mode"] == "intel"
+    assert row["away"] is False
+    assert row["control_enabled"] is True
+    assert row["intel_enabled"] is None
+    assert row["set_point"] == 52.0
+    assert exporter.stats["rows"] == 3
+    assert exporter.stats["batches"] == 2
+
+
+def test_rotates_large_files(tmp_path):
+    """A file past the size limit is finished and the next batch starts a new one."""
+    exporter = TelemetryExporter(str(tmp_path))
+
+    with patch("custom_components.aquanta_willbe.export.MAX_FILE_SIZE", 1):
+        exporter.append(READINGS)
+        exporter.write(exporter.take())
+
+    assert exporter.stats["files"] == 1
+    assert all(name.endswith(".parquet") for name in os.listdir(tmp_path))
+
+    with patch(
+        "custom_components.aquanta_willbe.export.dt_util.utcnow",
+        return_value=datetime(2026, 1, 2, tzinfo=timezone.utc),
+    ):
+        exporter.append(READINGS)
+        exporter.close(exporter.take())
+
+    assert exporter.stats["files"] == 2
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_write_after_close_finishes_its_file(tmp_path):
+    """A batch written after close does not leave a partial file behind."""
+    exporter = TelemetryExporter(str(tmp_path))
+    exporter.append(READINGS)
+    batch = exporter.take()
+
+    exporter.append(READINGS)
+    exporter.close(exporter.take())
+    exporter.write(batch)
+
+    names = os.listdir(tmp_path)
+    assert len(names) == 2
+    assert all(name.endswith(".parquet") for name in names)
+    assert sum(pq.read_table(tmp_path / name).num_rows for name in names) == 2
+
+
+def test_export_available():
+    """Test that pyarrow is detected when installed."""
+    assert export_available()
+    with patch("importlib.util.find_spec", return_value=None):
+        assert not export_available()
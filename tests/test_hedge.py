@@ -0,0 +1,97 @@
+"""Test hedging slow reads."""
+import threading
+import time
+
+import pytest
+
+from custom_components.aquanta_willbe.hedge import MIN_SAMPLES, RequestHedger
+
+
+def _slow_first(release: threading.Event):
+    """Return a read whose first call hangs until RELEASE is set."""
+    calls = []
+
+    def send():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    return send, calls
+
+
+def test_hedge_wins_over_slow_read():
+    """A read outstanding at the deadline is sent again and the hedge used."""
+    hedger = RequestHedger(default_deadline=0.05)
+    release = threading.Event()
+    send, calls = _slow_first(release)
+
+    try:
+        assert hedger.request(send) == "fast"
+    finally:
+        release.set()
+        hedger.shutdown()
+
+    assert len(calls) == 2
+    assert hedger.stats["hedged"] == 1
+    assert hedger.stats["hedge_wins"] == 1
+
+
+def test_fast_read_is_not_hedged():
+    """Reads answering before the deadline are sent once."""
+    hedger = RequestHedger(default_deadline=1.0)
+    calls = []
+
+    assert hedger.request(lambda: calls.append(1) or "ok") == "ok"
+    hedger.shutdown()
+
+    assert calls == [1]
+    assert hedger.stats["hedged"] == 0
+
+
+def test_budget_limits_hedges():
+    """Without budget a slow read is waited for instead of hedged."""
+    hedger = RequestHedger(default_deadline=0.01, budget_burst=1.0, budget_ratio=0.0)
+
+    def slow():
+        time.sleep(0.05)
+        return "ok"
+
+    assert [hedger.request(slow) for _ in range(3)] == ["ok"] * 3
+    hedger.shutdown()
+
+    assert hedger.stats["hedged"] == 1
+    assert hedger.stats["budget_exhausted"] == 2
+
+
+def test_failed_read_falls_back_to_hedge():
+    """An error is only raised when no other attempt succeeds."""
+    hedger = RequestHedger(default_deadline=0.01)
+    calls = []
+
+    def send():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.05)
+            raise RuntimeError("Aquanta: Failed to GET")
+        time.sleep(0.1)
+        return "ok"
+
+    assert hedger.request(send) == "ok"
+
+    with pytest.raises(RuntimeError):
+        hedger.request(lambda: (_ for _ in ()).throw(RuntimeError("down")))
+    hedger.shutdown()
+
+
+def test_deadline_follows_latencies():
+    """Once enough reads are seen the deadline tracks their high percentile."""
+    hedger = RequestHedger(default_deadline=2.0)
+    assert hedger.deadline == 2.0
+
+    for _ in range(MIN_SAMPLES):
+        hedger.request(lambda: time.sleep(0.3))
+    hedger.shutdown()
+
+    assert 0.3 <= hedger.deadline < 1.0
@@ -0,0 +1,38 @@
+"""Test the per-device reading history."""
+import pytest
+
+from custom_components.aquanta_willbe.history import ReadingHistory
+
+
+def test_rate_and_time_to_set_point():
+    """Test the heating rate and the time to reach the set point."""
+    history = ReadingHistory()
+    for minute in range(10):
+        history.append(minute * 60, 40 + minute * 0.5, 0.5)
+
+    assert history.rate == pytest.approx(30.0)
+    assert history.minutes_to(50.0) == pytest.approx(11.0)
+    assert history.minutes_to(40.0) == 0.0
+    assert history.minutes_to(None) is None
+
+
+def test_drawn_only_counts_the_last_hour():
+    """Test hot water drawn forgets draws older than an hour."""
+    history = ReadingHistory()
+    history.append(0, 50.0, 1.0)
+    history.append(60, 49.0, 0.8)
+    assert history.drawn == pytest.approx(0.2)
+
+    for minute in range(2, 70):
+        history.append(minute * 60, 49.0, 0.8)
+    assert history.drawn == pytest.approx(0.0)
+
+
+def test_ring_buffer_overwrites_oldest_readings():
+    """Test the buffer stays bounded and only recent readings count."""
+    history = ReadingHistory(size=4)
+    for minute in range(20):
+        history.append(minute, 60.0 - minute, 1.0)
+
+    assert len(history) == 4
+    assert history.rate == pytest.approx(-3600.0)
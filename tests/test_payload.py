@@ -0,0 +1,83 @@
+"""Test and benchmark the stored Aquanta payload."""
+import json
+import tracemalloc
+
+from custom_components.aquanta_willbe.payload import project_device, project_info
+
+DEVICES = 200
+RECORDS = 2000
+
+
+def _infocenter(records: int) -> dict:
+    """Return a synthetic infocenter response with a long schedule history."""
+    return {
+        "title": "Water heater",
+        "currentMode": {"type": "intelligence", "started": "2024-01-01T00:00:00Z"},
+        "records": [
+            {
+                "type": "boost" if index % 2 else "away",
+                "state": "ongoing" if index == records - 1 else "completed",
+                "start": "2024-01-01T00:00:00.000Z",
+                "end": "2024-01-01T00:30:00.000Z",
+                "id": index,
+            }
+            for index in range(records)
+        ],
+    }
+
+
+def _retained(build) -> int:
+    """Return the bytes still allocated by the objects build() returns."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return retained
+
+
+def test_only_ongoing_records_kept():
+    """Test the schedule history is reduced to its ongoing entries."""
+    info = project_info(_infocenter(10))
+
+    assert info["title"] == "Water heater"
+    assert info["currentMode"] == {"type": "intelligence"}
+    assert info["records"] == [{"type": "boost", "state": "ongoing"}]
+
+
+def test_missing_fields_projected_as_none():
+    """Test a sparse response still produces the full payload shape."""
+    payload = project_device({}, {}, {})
+
+    assert payload["water"] == {"temperature": None, "available": None}
+    assert payload["info"]["records"] == []
+    assert payload["advanced"]["setPoint"] is None
+
+
+def test_memory_per_device():
+    """Benchmark memory held per device for large infocenter responses."""
+    water = json.dumps({"temperature": 50.5, "available": 0.8, "history": [1] * 500})
+    info = json.dumps(_infocenter(RECORDS))
+    advanced = json.dumps({"setPoint": 55, "thermostatEnabled": True, "extra": "x"})
+
+    full = _retained(
+        lambda: [
+            {
+                "water": json.loads(water),
+                "info": json.loads(info),
+                "advanced": json.loads(advanced),
+            }
+            for _ in range(DEVICES)
+        ]
+    )
+    projected = _retained(
+        lambda: [
+            project_device(json.loads(water), json.loads(info), json.loads(advanced))
+            for _ in range(DEVICES)
+        ]
+    )
+
+    assert projected * 50 < full
+    # Only a few small dicts and strings are kept per device
+    assert projected / DEVICES < 4 * 1024
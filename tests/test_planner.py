@@ -0,0 +1,137 @@
+"""Test the fleet boost and away planner."""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import time
+from unittest.mock import MagicMock
+
+import requests
+
+from custom_components.aquanta_willbe.planner import (
+    PlanOptions,
+    Window,
+    plan_fleet,
+    submit_plan,
+)
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# Cheap overnight, peak in the evening
+PRICES = [0.10] * 6 + [0.20] * 10 + [0.45] * 4 + [0.20] * 4
+
+
+def _max_concurrent(windows) -> int:
+    """Return the most boosts running in any one slot."""
+    running = Counter()
+    for window in windows:
+        if window.mode == "boost":
+            slot = window.start
+            while slot < window.end:
+                running[slot] += 1
+                slot += timedelta(hours=1)
+    return max(running.values(), default=0)
+
+
+def test_boosts_staggered_under_load_cap():
+    """Test boosts never exceed the load cap and avoid the peak."""
+    windows = plan_fleet(
+        list(range(6)),
+        [40.0] * 6,
+        [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+        [False] * 6,
+        PRICES,
+        START,
+        PlanOptions(load_cap=9.0, heater_power=4.5),
+    )
+
+    boosts = [window for window in windows if window.mode == "boost"]
+    assert boosts
+    assert _max_concurrent(boosts) <= 2
+    peak_start = START + timedelta(hours=16)
+    assert all(
+        window.end <= peak_start or window.start >= peak_start + timedelta(hours=4)
+        for window in boosts
+    )
+    # The emptiest tank is boosted first, in the cheapest slots
+    assert boosts[0].aquanta_id == 0
+    assert boosts[0].start == START
+
+
+def test_peak_away_and_skipped_devices():
+    """Test full tanks coast through the peak and TOU devices are left alone."""
+    windows = plan_fleet(
+        ["full", "tou", "offline"],
+        [55.0, 55.0, None],
+        [0.95, 0.95, None],
+        [False, True, False],
+        PRICES,
+        START,
+    )
+
+    assert windows == [
+        Window(
+            "full",
+            "away",
+            START + timedelta(hours=16),
+            START + timedelta(hours=20),
+        )
+    ]
+
+
+def test_no_boosts_below_one_heater():
+    """Test a load cap below one heater's draw only plans away windows."""
+    windows = plan_fleet(
+        [1, 2],
+        [40.0, 55.0],
+        [0.1, 0.95],
+        [False, False],
+        PRICES,
+        START,
+        PlanOptions(load_cap=3.0, heater_power=4.5),
+    )
+
+    assert [window.mode for window in windows] == ["away"]
+
+
+def test_submit_plan_reports_failures():
+    """Test windows are sent to their devices and failures returned."""
+    device = MagicMock()
+    device.set_away.side_effect = RuntimeError
+    timing_out = MagicMock()
+    timing_out.set_boost.side_effect = requests.Timeout
+    client = MagicMock()
+    client.devices.return_value = {1: device, 3: timing_out}
+    boost = Window(1, "boost", START, START + timedelta(hours=1))
+    away = Window(1, "away", START, START + timedelta(hours=1))
+    unknown = Window(2, "boost", START, START + timedelta(hours=1))
+    timeout = Window(3, "boost", START, START + timedelta(hours=1))
+
+    assert submit_plan(client, [boost, away, unknown, timeout]) == [
+        away,
+        unknown,
+        timeout,
+    ]
+    device.set_boost.assert_called_once_with(
+        "2024-01-01T00:00:00.000Z", "2024-01-01T01:00:00.000Z"
+    )
+
+    client.devices.side_effect = requests.ConnectionError
+    assert submit_plan(client, [boost]) == [boost]
+
+
+def test_plan_large_fleet():
+    """Benchmark planning for a fleet of a thousand heaters."""
+    devices = 1000
+    started = time.perf_counter()
+    windows = plan_fleet(
+        list(range(devices)),
+        [45.0] * devices,
+        [index / devices for index in range(devices)],
+        [index % 10 == 0 for index in range(devices)],
+        PRICES * 2,
+        START,
+        PlanOptions(load_cap=450.0),
+    )
+    elapsed = time.perf_counter() - started
+
+    assert _max_concurrent(windows) <= 100
+    assert len(windows) > devices // 2
+    assert elapsed < 1.0
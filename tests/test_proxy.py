@@ -0,0 +1,171 @@
+"""Test reading an account through another instance."""
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.setup import async_setup_component
+import pytest
+import requests
+
+from custom_components.aquanta_willbe.api import AquantaApiHelper, device_path
+from custom_components.aquanta_willbe.const import DOMAIN
+from custom_components.aquanta_willbe.coordinator import AquantaCoordinator
+from custom_components.aquanta_willbe.payload import project_device, project_water
+from custom_components.aquanta_willbe.proxy import (
+    async_register_proxy_view,
+    proxy_account_key,
+)
+from custom_components.aquanta_willbe.transport import ProxyTransport
+
+from .const import MOCK_CONFIG
+
+ACCOUNT = proxy_account_key(MOCK_CONFIG["username"])
+BASE = f"/api/{DOMAIN}/proxy/{ACCOUNT}/v2/devices"
+
+
+def _helper():
+    """Return a helper reading through a mocked serving instance."""
+    session = MagicMock()
+    session.request.return_value = MagicMock(
+        ok=True,
+        status_code=200,
+        content=b'{"temperature": 51.0, "available": 0.7}',
+        headers={"ETag": '"abc"'},
+    )
+    helper = AquantaApiHelper(None, None)
+    helper.headers = {"Authorization": "Bearer aquanta-key"}
+    helper.transport = ProxyTransport(
+        "http://hass.local:8123/", "hass-token", "0123456789abcdef", session
+    )
+    return helper, session
+
+
+def test_proxy_replaces_credentials():
+    """Reads go to the serving instance with its token, never the API key."""
+    helper, session = _helper()
+
+    water = helper.get(device_path(7, "water"), project_water)
+
+    assert water == {"temperature": 51.0, "available": 0.7}
+    method, url = session.request.call_args.args
+    assert method == "GET"
+    assert url == (
+        f"http://hass.local:8123/api/{DOMAIN}/proxy/0123456789abcdef"
+        "/v2/devices/7/water"
+    )
+    headers = session.request.call_args.kwargs["headers"]
+    assert headers["Authorization"] == "Bearer hass-token"
+
+
+def test_proxy_commands_are_forwarded():
+    """Commands are sent to the serving instance with their body."""
+    helper, session = _helper()
+
+    helper.put(device_path(7, "boost"), {"start": "a", "end": "b"})
+
+    method, url = session.request.call_args.args
+    assert method == "PUT"
+    assert url.endswith("/v2/devices/7/boost")
+    assert session.request.call_args.kwargs["json"] == {"start": "a", "end": "b"}
+
+
+def test_account_key_ignores_case():
+    """Both instances derive the same key from the username."""
+    assert proxy_account_key("User@Example.com") == proxy_account_key(
+        "user@example.com"
+    )
+    assert "example" not in proxy_account_key("user@example.com")
+
+
+@pytest.fixture
+async def serving(hass):
+    """Return a coordinator shared through the proxy view."""
+    assert await async_setup_component(hass, "http", {})
+    coordinator = AquantaCoordinator(
+        hass, MagicMock(), MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    )
+    coordinator.proxy_serve = True
+    coordinator.data = {
+        "id": MOCK_CONFIG["username"],
+        "devices": {
+            7: project_device(
+                {"temperature": 51.0, "available": 0.7},
+                {"title": "Garage", "currentMode": {"type": "intel"}},
+                {"thermostatEnabled": False},
+            )
+        },
+    }
+    hass.data[DOMAIN] = {"entry": coordinator}
+    async_register_proxy_view(hass)
+    return coordinator
+
+
+async def test_view_serves_snapshot(hass, hass_client, serving):
+    """Test reads are answered from the snapshot and revalidated by ETag."""
+    client = await hass_client()
+
+    resp = await client.get(BASE)
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == [{"id": 7}]
+
+    resp = await client.get(f"{BASE}/7/water")
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == {"temperature": 51.0, "available": 0.7}
+    etag = resp.headers["ETag"]
+
+    resp = await client.get(f"{BASE}/7/water", headers={"If-None-Match": etag})
+    assert resp.status == HTTPStatus.NOT_MODIFIED
+
+    resp = await client.get(f"{BASE}/7/infocenter")
+    assert (await resp.json())["title"] == "Garage"
+
+
+async def test_view_errors(hass, hass_client, serving):
+    """Test unknown accounts and resources, and unavailable data."""
+    client = await hass_client()
+
+    resp = await client.get(f"/api/{DOMAIN}/proxy/0000000000000000/v2/devices")
+    assert resp.status == HTTPStatus.NOT_FOUND
+    assert (await client.get(f"{BASE}/8/water")).status == HTTPStatus.NOT_FOUND
+    assert (await client.get(f"{BASE}/7/boost")).status == HTTPStatus.NOT_FOUND
+
+    serving.proxy_serve = False
+    assert (await client.get(BASE)).status == HTTPStatus.NOT_FOUND
+
+    serving.proxy_serve = True
+    serving.last_update_success = False
+    assert (await client.get(BASE)).status == HTTPStatus.SERVICE_UNAVAILABLE
+
+
+async def test_view_requires_admin(
+    hass, hass_client, hass_read_only_access_token, serving
+):
+    """Test only administrators may read through the proxy."""
+    client = await hass_client(hass_read_only_access_token)
+
+    assert (await client.get(BASE)).status == HTTPStatus.UNAUTHORIZED
+    resp = await client.put(f"{BASE}/7/boost", json={"start": "a", "end": "b"})
+    assert resp.status == HTTPStatus.UNAUTHORIZED
+    serving.aquanta._helper.put.assert_not_called()
+
+
+async def test_view_forwards_commands(hass, hass_client, serving):
+    """Test commands are sent upstream and upstream failures reported."""
+    client = await hass_client()
+    helper = serving.aquanta._helper
+
+    with patch.object(serving, "async_request_verify", AsyncMock()) as verify:
+        resp = await client.put(f"{BASE}/7/boost", json={"start": "a", "end": "b"})
+        assert resp.status == HTTPStatus.OK
+        helper.put.assert_called_once_with(
+            "/v2/devices/7/boost", {"start": "a", "end": "b"}
+        )
+        verify.assert_awaited_once()
+
+        resp = await client.delete(f"{BASE}/7/away")
+        assert resp.status == HTTPStatus.OK
+        helper.delete.assert_called_once_with("/v2/devices/7/away")
+
+        helper.put.side_effect = requests.Timeout("timed out")
+        resp = await client.put(f"{BASE}/7/boost", json={"start": "a", "end": "b"})
+        assert resp.status == HTTPStatus.BAD_GATEWAY
+        assert verify.await_count == 2
@@ -0,0 +1,102 @@
+"""Replay a recorded Aquanta API trace through the integration.
+
+Run with scripts/replay, or set AQUANTA_TRACE to a trace recorded with the
+"Record API trace" option. The trace is fed through the coordinator and
+every platform with idle time skipped, and a report of refresh latency, API
+calls, state writes and CPU time per simulated hour is written to
+AQUANTA_TRACE_REPORT.
+"""
+from datetime import timedelta
+import os
+import time
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.aquanta_willbe.const import DOMAIN
+from custom_components.aquanta_willbe.trace import (
+    ReplayAquanta,
+    ReplayReport,
+    load_trace,
+)
+
+from .const import MOCK_CONFIG
+
+TRACE = os.environ.get("AQUANTA_TRACE")
+REPORT = os.environ.get("AQUANTA_TRACE_REPORT")
+
+# Simulated time advanced per step; fine enough for every timer to fire
+STEP = timedelta(seconds=5)
+
+
+@pytest.mark.skipif(TRACE is None, reason="AQUANTA_TRACE is not set")
+async def test_replay_trace(hass, freezer):
+    """Test the integration keeps up with a recorded trace."""
+    exchanges = await hass.async_add_executor_job(load_trace, TRACE)
+    duration = timedelta(seconds=exchanges[-1]["t"])
+    start = dt_util.utcnow()
+
+    def sim_time() -> float:
+        return (dt_util.utcnow() - start).total_seconds()
+
+    client = ReplayAquanta(
+        exchanges,
+        sim_time,
+        float(os.environ.get("AQUANTA_TRACE_LATENCY_SCALE", "1")),
+    )
+    report = ReplayReport()
+
+    @callback
+    def count_state_write(event) -> None:
+        report.add(sim_time(), "state_writes")
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_write)
+
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, entry_id="replay")
+    entry.add_to_hass(hass)
+    with patch("custom_components.aquanta_willbe.login", return_value=client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    update = coordinator._async_update_data
+
+    async def timed_update():
+        began = time.perf_counter()
+        try:
+            return await update()
+        finally:
+            report.add_refresh(sim_time(), time.perf_counter() - began)
+
+    coordinator._async_update_data = timed_update
+
+    calls = sum(client._helper.transport.calls.values())
+    while dt_util.utcnow() - start < duration:
+        cpu = time.process_time()
+        freezer.tick(STEP)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+        now = sim_time()
+        report.add(now, "cpu", time.process_time() - cpu)
+        total = sum(client._helper.transport.calls.values())
+        report.add(now, "api_calls", total - calls)
+        calls = total
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+    if REPORT:
+        await hass.async_add_executor_job(report.save, REPORT)
+
+    rows = report.summary()
+    assert rows
+    assert all(row["refreshes"] for row in rows)
+    assert sum(row["api_calls"] for row in rows) > 0
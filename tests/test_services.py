@@ -0,0 +1,52 @@
+"""Test the Aquanta services."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.aquanta_willbe.const import DOMAIN
+from custom_components.aquanta_willbe.coordinator import AquantaCoordinator
+from custom_components.aquanta_willbe.payload import project_device
+from custom_components.aquanta_willbe.services import (
+    SERVICE_PLAN_FLEET,
+    async_setup_services,
+)
+
+from .const import MOCK_CONFIG
+
+PRICES = [0.10] * 6 + [0.20] * 10 + [0.45] * 4 + [0.20] * 4
+
+
+def _device(available: float) -> dict:
+    return project_device(
+        {"temperature": 45.0, "available": available},
+        {"title": "Tank", "currentMode": {"type": "intel"}},
+        {"touEnabled": False},
+    )
+
+
+async def test_plan_fleet_reports_set_windows(hass):
+    """Test the response tells windows that were set from ones that failed."""
+    coordinator = AquantaCoordinator(
+        hass, MagicMock(), MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    )
+    coordinator.data = {
+        "id": MOCK_CONFIG["username"],
+        "devices": {1: _device(0.2), 2: _device(0.95)},
+    }
+    devices = {1: MagicMock(), 2: MagicMock()}
+    devices[2].set_away.side_effect = RuntimeError
+    coordinator.aquanta.devices.return_value = devices
+    hass.data[DOMAIN] = {"entry": coordinator}
+    async_setup_services(hass)
+
+    with patch.object(coordinator, "async_request_verify", AsyncMock()):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PLAN_FLEET,
+            {"prices": PRICES},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert [window["mode"] for window in response["windows"]] == ["away", "boost"]
+    assert [window["device"] for window in response["set"]] == ["1"]
+    assert [window["device"] for window in response["failed"]] == ["2"]
+    devices[1].set_boost.assert_called_once()
@@ -0,0 +1,94 @@
+"""Test handing off the config flow session to entry setup."""
+from unittest.mock import MagicMock, patch
+
+from homeassistant import config_entries
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.aquanta_willbe.const import DOMAIN
+from custom_components.aquanta_willbe.session import (
+    async_pop_login,
+    async_store_login,
+)
+
+from .const import MOCK_CONFIG
+
+
+async def test_login_handed_off_once(hass):
+    """Test a stored login is reused by exactly one setup."""
+    client = MagicMock()
+    async_store_login(hass, "test_username", "test_password", client)
+
+    assert async_pop_login(hass, "test_username", "test_password") is client
+    assert async_pop_login(hass, "test_username", "test_password") is None
+
+
+async def test_login_not_handed_off_with_other_password(hass):
+    """Test a stored login is not reused when the password changed."""
+    async_store_login(hass, "test_username", "old_password", MagicMock())
+
+    assert async_pop_login(hass, **_credentials()) is None
+
+
+async def test_expired_login_not_handed_off(hass):
+    """Test a stored login is dropped once it is too old."""
+    with patch(
+        "custom_components.aquanta_willbe.session.time.monotonic", return_value=0
+    ):
+        async_store_login(hass, "test_username", "test_password", MagicMock())
+
+    with patch(
+        "custom_components.aquanta_willbe.session.time.monotonic", return_value=3600
+    ):
+        assert async_pop_login(hass, **_credentials()) is None
+
+
+async def test_setup_reuses_config_flow_login(hass):
+    """Test the entry created by the flow is set up with the flow's session."""
+    client = MagicMock()
+    # Enumerated by the flow's login and cached by the library
+    client._devices = {7: None}
+    client.devices.return_value = client._devices
+    device = {
+        "water": {"temperature": 50.0, "available": 0.8},
+        "info": {"title": "Garage", "currentMode": {"type": "intel"}, "records": []},
+        "advanced": {
+            "controlEnabled": True,
+            "intelEnabled": True,
+            "thermostatEnabled": False,
+            "touEnabled": False,
+            "timerEnabled": False,
+            "setPoint": None,
+        },
+    }
+
+    with patch(
+        "custom_components.aquanta_willbe.session.create_client",
+        return_value=client,
+    ) as create_client, patch(
+        "custom_components.aquanta_willbe.coordinator.fetch_device",
+        return_value=device,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input=MOCK_CONFIG
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    create_client.assert_called_once_with(
+        MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    )
+    coordinator = hass.data[DOMAIN][result["result"].entry_id]
+    assert coordinator.aquanta is client
+    assert coordinator.data["devices"] == {7: device}
+    # The device list was not dropped and enumerated again
+    assert client._devices == {7: None}
+
+
+def _credentials():
+    return {
+        "username": MOCK_CONFIG["username"],
+        "password": MOCK_CONFIG["password"],
+    }
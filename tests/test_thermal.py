@@ -0,0 +1,53 @@
+"""Test the tank thermal estimator."""
+import pytest
+
+from custom_components.aquanta_willbe.thermal import MAX_HORIZON, ThermalEstimator
+
+
+def test_untrained_estimator_holds_last_reading():
+    """Test the last reading is returned until a rate has been learned."""
+    estimator = ThermalEstimator()
+    estimator.update(50.0, 0.5, 0)
+
+    assert not estimator.trained
+    assert estimator.predict_temperature(60) == 50.0
+    assert estimator.predict_available(60) == 0.5
+    assert estimator.seconds_until_error(1.0) is None
+
+
+def test_interpolates_while_heating_up_to_set_point():
+    """Test the heating rate is extrapolated and capped at the set point."""
+    estimator = ThermalEstimator()
+    estimator.update(40.0, 0.2, 0, set_point=50.0)
+    estimator.update(41.0, 0.3, 60, set_point=50.0)
+
+    assert estimator.heating
+    assert estimator.predict_temperature(90) == pytest.approx(41.5)
+    assert estimator.predict_available(90) == pytest.approx(0.35)
+    assert estimator.predict_temperature(60 + 3600) == 50.0
+
+
+def test_standby_decay_is_held_past_horizon():
+    """Test standby decay stops being extrapolated past the horizon."""
+    estimator = ThermalEstimator()
+    estimator.update(50.0, 1.0, 0)
+    estimator.update(49.9, 1.0, 600)
+    horizon = MAX_HORIZON.total_seconds()
+
+    assert not estimator.heating
+    assert estimator.predict_temperature(600 + horizon) == estimator.predict_temperature(
+        600 + 10 * horizon
+    )
+
+
+def test_error_rate_shortens_horizon():
+    """Test inaccurate predictions bring the next poll closer."""
+    estimator = ThermalEstimator()
+    estimator.update(50.0, 1.0, 0)
+    estimator.update(50.0, 1.0, 60)
+    estimator.update(50.0, 1.0, 120)
+    accurate = estimator.seconds_until_error(1.0)
+
+    estimator.update(48.0, 0.9, 180)
+
+    assert estimator.seconds_until_error(1.0) < accurate
@@ -0,0 +1,93 @@
+"""Test recording and replaying Aquanta API traces."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.aquanta_willbe.api import AquantaApiHelper, device_path
+from custom_components.aquanta_willbe.payload import project_water
+from custom_components.aquanta_willbe.trace import (
+    REDACTED,
+    ReplayAquanta,
+    TraceRecorder,
+    load_trace,
+)
+
+
+def _exchange(start, path, body):
+    return {
+        "t": start,
+        "method": "GET",
+        "path": path,
+        "status": 200,
+        "elapsed": 0.1,
+        "body": body,
+    }
+
+
+def test_recorded_trace_is_sanitized(tmp_path):
+    """Test credentials, personal details and device IDs stay out of traces."""
+    session = MagicMock()
+    session.get.return_value = MagicMock(
+        ok=True,
+        status_code=200,
+        content=b'[{"id": 73012, "title": "Garage", "serialNumber": "A1"}]',
+    )
+    helper = AquantaApiHelper(session, 5)
+    helper.recorder = TraceRecorder(str(tmp_path / "trace.jsonl"))
+
+    helper.get("/v2/devices")
+    session.get.return_value.content = b'{"temperature": 50.0, "available": 0.5}'
+    helper.get(device_path(73012, "water"), project_water)
+    helper.recorder.close()
+
+    devices, water = load_trace(str(tmp_path / "trace.jsonl"))
+    assert devices["body"] == [{"id": 1, "title": REDACTED, "serialNumber": REDACTED}]
+    assert water["path"] == "/v2/devices/1/water"
+    assert water["body"] == {"temperature": 50.0, "available": 0.5}
+    assert water["size"] == 39
+    assert "73012" not in (tmp_path / "trace.jsonl").read_text()
+
+
+def test_replay_follows_simulated_time():
+    """Test replayed reads return the latest response at the simulated time."""
+    now = 0.0
+    client = ReplayAquanta(
+        [
+            _exchange(0.0, "/v2/devices", [{"id": 1}]),
+            _exchange(0.5, "/v2/devices/1/water", {"temperature": 40.0}),
+            _exchange(60.5, "/v2/devices/1/water", {"temperature": 45.0}),
+        ],
+        lambda: now,
+        latency_scale=0,
+    )
+
+    device = client.devices()[1]
+    assert device.water == {"temperature": 40.0}
+
+    now = 90.0
+    assert device.water == {"temperature": 45.0}
+    assert client._helper.transport.calls["GET"] == 3
+
+
+def test_non_json_bodies_are_kept_raw(tmp_path):
+    """Test error pages are recorded as is and recording carries on."""
+    session = MagicMock()
+    session.get.return_value = MagicMock(
+        ok=False, status_code=502, content=b"<html>Bad Gateway</html>"
+    )
+    helper = AquantaApiHelper(session, 5)
+    helper.recorder = TraceRecorder(str(tmp_path / "trace.jsonl"))
+
+    with pytest.raises(RuntimeError):
+        helper.get(device_path(7, "water"), project_water)
+    assert helper.recorder is not None
+    helper.recorder.close()
+
+    (outage,) = load_trace(str(tmp_path / "trace.jsonl"))
+    assert outage["status"] == 502
+    assert outage["body"] is None
+
+    # Replayed, the page comes back byte for byte
+    client = ReplayAquanta([outage], lambda: 0.0, latency_scale=0)
+    response = client._helper.transport.request("GET", outage["path"], {})
+    assert response.content == b"<html>Bad Gateway</html>"
@@ -0,0 +1,126 @@
+"""Test the local network transport against a stand-in controller."""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.aquanta_willbe.api import AquantaApiHelper, device_path
+from custom_components.aquanta_willbe.payload import project_water
+from custom_components.aquanta_willbe.transport import LocalTransport
+
+
+class _ControllerHandler(BaseHTTPRequestHandler):
+    """Serve device resources the way a local controller would."""
+
+    resources = {"/v2/devices/7/water": {"temperature": 51.0, "available": 0.7}}
+    pages = {"/v2/devices/7/infocenter": b"<html>Aquanta</html>"}
+    received: list = []
+
+    def do_GET(self):  # noqa: N802
+        self.received.append(("GET", self.path, self.headers.get("Authorization")))
+        if (page := self.pages.get(self.path)) is not None:
+            content, content_type = page, "text/html"
+        elif (body := self.resources.get(self.path)) is not None:
+            content, content_type = json.dumps(body).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_PUT(self):  # noqa: N802
+        self.received.append(("PUT", self.path, self.headers.get("Authorization")))
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        """Keep test output quiet."""
+
+
+@pytest.fixture
+def controller():
+    """Run a stand-in controller on localhost and return its address."""
+    _ControllerHandler.received = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ControllerHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _helper(hosts):
+    """Return a helper reading locally from HOSTS and from a mocked cloud."""
+    session = MagicMock()
+    session.get.return_value = MagicMock(
+        ok=True, content=b'{"temperature": 40.0, "available": 0.1}'
+    )
+    session.put.return_value = MagicMock(ok=True)
+    helper = AquantaApiHelper(session, 5)
+    helper.headers = {"Authorization": "Bearer secret"}
+    helper.transport = LocalTransport(helper.transport, hosts)
+    return helper, session
+
+
+def test_reads_discovered_controller_locally(controller):
+    """Test a known controller is read over the LAN without credentials."""
+    helper, session = _helper({"7": controller})
+
+    assert helper.get(device_path(7, "water"), project_water) == {
+        "temperature": 51.0,
+        "available": 0.7,
+    }
+    assert session.get.call_count == 0
+    assert _ControllerHandler.received == [("GET", "/v2/devices/7/water", None)]
+    assert helper.transport.stats["local"] == 1
+
+
+def test_falls_back_to_cloud(controller):
+    """Test unsupported resources and unknown devices are read from the cloud."""
+    helper, session = _helper({"7": controller})
+
+    # The stand-in controller does not serve this resource
+    helper.get(device_path(7, "advanced"))
+    # No address known for this device
+    helper.get(device_path(8, "water"))
+
+    assert session.get.call_count == 2
+    assert helper.transport.stats == {"local": 0, "cloud": 2, "fallbacks": 1}
+
+    # The controller is skipped for a while after failing
+    helper.get(device_path(7, "water"))
+    assert session.get.call_count == 3
+
+
+def test_non_json_answer_falls_back(controller):
+    """Test a page that is not a JSON document is read from the cloud instead."""
+    helper, session = _helper({"7": controller})
+
+    assert helper.get(device_path(7, "infocenter")) == {
+        "temperature": 40.0,
+        "available": 0.1,
+    }
+    assert session.get.call_count == 1
+    assert helper.transport.stats["fallbacks"] == 1
+
+
+def test_commands_wait_for_a_verified_read(controller):
+    """Test commands only go to a controller that has answered a read."""
+    helper, session = _helper({"7": controller})
+    boost = {"start": "a", "end": "b"}
+
+    helper.put(device_path(7, "boost"), boost)
+    assert session.put.call_count == 1
+    assert not any(method == "PUT" for method, *_ in _ControllerHandler.received)
+
+    helper.get(device_path(7, "water"), project_water)
+    helper.put(device_path(7, "boost"), boost)
+    assert session.put.call_count == 1
+    assert ("PUT", "/v2/devices/7/boost", None) in _ControllerHandler.received
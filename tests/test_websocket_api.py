@@ -0,0 +1,103 @@
+"""Test the fleet websocket subscription."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from custom_components.aquanta_willbe.const import DOMAIN
+from custom_components.aquanta_willbe.coordinator import AquantaCoordinator
+from custom_components.aquanta_willbe.websocket_api import (
+    async_register_websocket_commands,
+    compact_device,
+    compact_fleet,
+)
+
+from .const import MOCK_CONFIG
+
+
+def _device(temperature, mode="intelligence", records=()):
+    return {
+        "water": {"temperature": temperature, "available": 0.8},
+        "info": {
+            "title": "Garage",
+            "currentMode": {"type": mode},
+            "records": list(records),
+        },
+        "advanced": {
+            "controlEnabled": True,
+            "thermostatEnabled": True,
+            "setPoint": 55.0,
+        },
+    }
+
+
+def test_compact_device():
+    """Test a device is reduced to the fields clients display."""
+    assert compact_device(
+        _device(50.0, records=[{"type": "boost", "state": "ongoing"}])
+    ) == {
+        "name": "Garage",
+        "temperature": 50.0,
+        "available": 0.8,
+        "mode": "intelligence",
+        "away": False,
+        "boost": True,
+        "set_point": 55.0,
+        "control_enabled": True,
+    }
+
+
+def test_compact_fleet_keys_are_strings():
+    """Test device IDs are usable as JSON object keys."""
+    coordinator = SimpleNamespace(
+        data={"devices": {1: _device(50.0), 2: _device(40.0, mode="away")}}
+    )
+
+    fleet = compact_fleet(coordinator)
+
+    assert list(fleet) == ["1", "2"]
+    assert fleet["2"]["away"] is True
+
+
+async def test_subscribe_sends_changes_and_status(hass, hass_ws_client):
+    """Test subscribers get a snapshot, then data and status changes."""
+    coordinator = AquantaCoordinator(
+        hass, MagicMock(), MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    )
+    coordinator.data = {"id": MOCK_CONFIG["username"], "devices": {1: _device(50.0)}}
+    hass.data[DOMAIN] = {"entry": coordinator}
+    async_register_websocket_commands(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {"id": 1, "type": f"{DOMAIN}/fleet/subscribe", "entry_id": "entry"}
+    )
+    assert (await client.receive_json())["success"]
+    event = (await client.receive_json())["event"]
+    assert event["snapshot"] == {"1": compact_device(_device(50.0))}
+    assert event["last_update_success"] is True
+    assert event["stale"] is False
+
+    coordinator.async_set_updated_data(
+        {"id": MOCK_CONFIG["username"], "devices": {1: _device(45.0)}}
+    )
+    event = (await client.receive_json())["event"]
+    assert event["changed"] == {"1": compact_device(_device(45.0))}
+    assert event["removed"] == []
+
+    # The data is unchanged, but clients must learn it is unavailable
+    coordinator.async_set_update_error(RuntimeError("down"))
+    event = (await client.receive_json())["event"]
+    assert event["changed"] == {}
+    assert event["last_update_success"] is False
+
+
+async def test_subscribe_unknown_entry(hass, hass_ws_client):
+    """Test subscribing to an entry that is not loaded fails."""
+    async_register_websocket_commands(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {"id": 1, "type": f"{DOMAIN}/fleet/subscribe", "entry_id": "missing"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"